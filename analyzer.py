@@ -1,18 +1,28 @@
 from swingc.parser import SwingCParser
+from swingc.stats import NULL_STATS
 from itertools import chain
 import re
 
 class SwingCAnalyzer(object):
-    def __init__(self, parser):
+    def __init__(self, parser, stats=None):
         self.parser = parser
         self.basename = parser.basename
+
+        # stats를 따로 주지 않으면 parser의 stats에 같이 기록
+        self.stats = stats if stats is not None else parser.stats
         self.analyze()
 
     def analyze(self):
-        self.track_unmatched_funcs()
-        self.track_unreachable_funcs()
-        self.track_gray_dbio()
-        self.track_gray_module()
+        stats = self.stats or NULL_STATS
+
+        with stats.stage('analyze.unmatched_funcs'):
+            self.track_unmatched_funcs()
+        with stats.stage('analyze.unreachable_funcs'):
+            self.track_unreachable_funcs()
+        with stats.stage('analyze.gray_dbio'):
+            self.track_gray_dbio()
+        with stats.stage('analyze.gray_module'):
+            self.track_gray_module()
 
     def track_unmatched_funcs(self):
         v = self.parser.visit
@@ -24,27 +34,39 @@ class SwingCAnalyzer(object):
     def track_unreachable_funcs(self):
         # 호출되지 않는 static 함수
         v = self.parser.visit
+        defns = set(v.defns)
+
+        # 함수별 호출되는 횟수, caller별 callee 리스트
+        call_counts = dict.fromkeys(defns, 0)
+        callees = {}
+
+        for item in v.calls:
+            if item.callee in defns:
+                call_counts[item.callee] += 1
+                callees.setdefault(item.caller, []).append(item.callee)
+
+        # 호출이 없는 함수부터 제거하고, 제거된 함수가 호출하던 함수의 횟수를 차감
+        # 횟수가 0이 되면 다시 worklist에 추가 (호출안되는 함수가 없어질때까지)
+        worklist = [item for item in defns if call_counts[item] == 0 and item != v.main]
+        outsiders = set(worklist)
 
-        callees = []
-        real_calls = []
-        outsiders = []
+        iterations = 0
 
-        real_calls = v.calls.copy()
+        while worklist:
+            caller = worklist.pop()
+            iterations += 1
 
-        # 호출안되는 함수가 없어질때까지 반복
-        while True:
-            callees = set([item.callee for item in real_calls if item.callee in v.defns])
-            outsiders.extend([item for item in v.defns if item not in callees and item != v.main])
+            for callee in callees.get(caller, []):
+                call_counts[callee] -= 1
 
-            # filter해도 동일하면 종료
-            if len(real_calls) == len([item for item in real_calls if item.caller not in outsiders]):
-                break
-            # filter한 결과가 다르면 삭제된 call이 있으므로 갱신하고 다시 loop
-            else:
-                real_calls = [item for item in real_calls if item.caller not in outsiders]
+                if call_counts[callee] == 0 and callee != v.main and callee not in outsiders:
+                    outsiders.add(callee)
+                    worklist.append(callee)
 
-        self.real_calls = real_calls
-        self.outsiders = sorted(set(outsiders))
+        self.real_calls = [item for item in v.calls if item.caller not in outsiders]
+        self.outsiders = sorted(outsiders)
+
+        (self.stats or NULL_STATS).count('unreachable_iterations', iterations)
 
     def track_gray_dbio(self):
         # 호출안하는 DBIO리스트 확인
@@ -56,14 +78,17 @@ class SwingCAnalyzer(object):
         len_only_dbios = []
         dynamic_dbio_calls = []
 
-        for header_file in p.headers['dbio']:
-            dbio_name = re.match(r'pdb_(\w+)\.h', header_file).group(1)
-
-            all_dbio_calls = [item.callee for item in v.calls if item.kind == 'DBIO']
-            real_dbio_calls = [item.callee for item in self.real_calls if item.kind == 'DBIO']
+        # 호출종류별 index는 header와 무관하므로 1번만 생성
+        outsiders = set(self.outsiders)
+        all_dbio_calls = set([item.callee for item in v.calls if item.kind == 'DBIO'])
+        real_dbio_calls = set([item.callee for item in self.real_calls if item.kind == 'DBIO'])
+        dbio_len_ids = set([item[1] for item in v.ids if item[3] == 'DBIO' and item[0] not in outsiders])
 
+        if p.headers['dbio']:
             dynamic_dbio_calls = [item.callee for item in self.real_calls if item.kind == 'DBIO' and item.more[1] != 'Constant']
-            dbio_len_ids = [item[1] for item in v.ids if item[3] == 'DBIO' and item[0] not in self.outsiders]
+
+        for header_file in p.headers['dbio']:
+            dbio_name = re.match(r'pdb_(\w+)\.h', header_file).group(1)
 
             # DBIO 호출이 아예  없을 경우 : include만 해둔 경우
             if dbio_name not in all_dbio_calls:
@@ -90,15 +115,16 @@ class SwingCAnalyzer(object):
         zero_call_modules = []
         dynamic_call_modules = []
 
-        for item in p.headers['module']:
-            all_api_modules = set(chain.from_iterable([item.more for item in v.calls if item.kind == 'API']))
-            all_call_modules = set([item.callee + '.h' for item in v.calls if item.kind == 'MODULE'])
+        # 호출종류별 index는 header와 무관하므로 1번만 생성
+        all_api_modules = set(chain.from_iterable([item.more for item in v.calls if item.kind == 'API']))
+        all_call_modules = set([item.callee + '.h' for item in v.calls if item.kind == 'MODULE'])
 
-            real_api_modules = set(chain.from_iterable([item.more for item in self.real_calls if item.kind == 'API']))
-            real_call_modules = set([item.callee + '.h' for item in self.real_calls if item.kind == 'MODULE'])
-            
-            dynamic_call_modules = set([item.callee for item in self.real_calls if item.kind == 'MODULE' and item.more[1] != 'Constant'])
+        real_api_modules = set(chain.from_iterable([item.more for item in self.real_calls if item.kind == 'API']))
+        real_call_modules = set([item.callee + '.h' for item in self.real_calls if item.kind == 'MODULE'])
+        
+        dynamic_call_modules = set([item.callee for item in self.real_calls if item.kind == 'MODULE' and item.more[1] != 'Constant'])
 
+        for item in p.headers['module']:
             # if module's main header, skip
             if item.startswith(v.main):
                 continue
@@ -150,3 +176,19 @@ class SwingCAnalyzer(object):
         set('zero_call_modules', self.zero_call_modules)
         
         return export_dict
+
+    # 호출 관계 (swingc.callgraph, swingc.columnar 적재용)
+    #   - calls : [caller, callee, kind, more, real]
+    #     real : 호출되지 않는 static 함수(outsiders)에서의 호출이 아닌지
+    #   - ids : [func, header, id, kind]
+    #   - unknown : [caller, callee]
+    def export_calls(self):
+        v = self.parser.visit
+        outsiders = set(self.outsiders)
+
+        return {
+            'main': v.main,
+            'calls': [[item.caller, item.callee, item.kind, item.more, item.caller not in outsiders] for item in v.calls],
+            'ids': [list(item) for item in v.ids],
+            'unknown': [list(item) for item in v.unknown],
+        }
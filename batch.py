@@ -0,0 +1,105 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from swingc.parser import SwingCParser
+from swingc.analyzer import SwingCAnalyzer
+from swingc.stats import Stats
+
+SRC_EXT = '.c'
+
+# 소스파일 목록 : 디렉토리는 하위까지 순회
+def find_sources(paths):
+    if isinstance(paths, str):
+        paths = [paths]
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(SRC_EXT):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+# 파일 1개 분석 (pool worker) : (filename, export dict, stats dict)
+# ParseError/CalledProcessError는 SwingCParser에서 처리하므로, 결과만 None으로 돌려줌
+# 그 밖의 예외(visitor 오류, 분석 중 삭제된 파일 등)도 파일 1개의 실패로 보고 None
+# (한 파일 때문에 전체 트리 분석이 멈추지 않도록)
+# calls : export dict에 호출 관계(SwingCAnalyzer.export_calls)도 포함
+# includes : export dict에 include한 DBIO/모듈 헤더 목록도 포함 (헤더 --> 소스 역 index용)
+def analyze_file(filename, in_memory=False, stats=False, cpp='clang', calls=False, includes=False):
+    file_stats = Stats(filename) if stats else None
+    result = None
+
+    try:
+        parser = SwingCParser(filename, in_memory, file_stats, cpp=cpp)
+
+        if not parser.error:
+            analyzer = SwingCAnalyzer(parser)
+            result = analyzer.export()
+
+            if calls:
+                result['calls'] = analyzer.export_calls()
+            if includes:
+                result['includes'] = parser.pre.headers['dbio'] + parser.pre.headers['module']
+    except Exception as e:
+        print(os.path.basename(filename), '{}: {}'.format(e.__class__.__name__, e))
+
+    return filename, result, file_stats.export() if stats else None
+
+# 여러 파일 병렬 분석 : 끝나는 순서대로 (filename, export dict)를 돌려줌
+# cache(ResultCache)를 주면 내용이 바뀌지 않은 파일은 parsing하지 않음
+# stats_out(file)을 주면 파일별 Stats를 json line으로 기록
+# cpp : 전처리 backend ('clang', 'python')
+# in_memory=False(res/preproc, headers/에 파일을 씀)는 workers=1일 때만 적용
+def analyze_tree(paths, workers=None, in_memory=False, cache=None, stats_out=None, cpp='clang', calls=False, includes=False):
+    sources = list(find_sources(paths))
+    keys = {}
+    variant = ','.join(name for name, value in (('calls', calls), ('includes', includes)) if value)
+
+    if cache is not None:
+        pending = []
+        for filename in sources:
+            # 읽을 수 없는(목록 작성 후 삭제된) 파일은 캐시 miss로 보고 분석 단계에서 실패 처리
+            try:
+                keys[filename] = cache.key(filename, variant)
+            except OSError:
+                pending.append(filename)
+                continue
+
+            result = cache.get(keys[filename])
+
+            if result is None:
+                pending.append(filename)
+            else:
+                yield filename, result
+
+        sources = pending
+
+    for filename, result, stats in run_sources(sources, workers, in_memory, stats_out is not None, cpp, calls, includes):
+        if stats is not None:
+            stats_out.write(json.dumps(stats, ensure_ascii=False) + '\n')
+
+        # parsing 실패는 캐시하지 않음
+        if cache is not None and result is not None and filename in keys:
+            cache.put(keys[filename], result)
+
+        yield filename, result
+
+def run_sources(sources, workers=None, in_memory=False, stats=False, cpp='clang', calls=False, includes=False):
+    # worker 1개면 pool 없이 순차 처리
+    if workers == 1:
+        for filename in sources:
+            yield analyze_file(filename, in_memory, stats, cpp, calls, includes)
+        return
+
+    # pool에서는 항상 in_memory로 parsing
+    # res/preproc/<basename>, headers/<name>_fake.h는 파일명만으로 정해지므로
+    # 다른 디렉토리의 같은 이름 소스를 동시에 처리하면 서로 덮어씀
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_file, filename, True, stats, cpp, calls, includes) for filename in sources]
+
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,307 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+
+import pycparser
+
+from swingc import parser as swingc_parser
+from swingc.parser import SwingCParser
+from swingc.analyzer import SwingCAnalyzer
+from swingc.visitor import Call
+from swingc.stats import Stats
+
+BENCH_PATH = 'res/bench'
+
+STAGES = ('read', 'preprocess', 'fake_header', 'parse', 'visit', 'analyze')
+
+# 합성 소스 기본 설정
+CORPUS_CONFIG = {
+    'files': 20,            # 파일 수
+    'funcs': 10,            # 파일당 static 함수 수
+    'stmts': 8,             # 함수당 문장 수
+    'dbio_density': 0.15,   # 문장이 mpfmdbio* 호출일 확률
+    'dlcall_density': 0.05, # 문장이 mpfm_dlcall 호출일 확률
+    'if0_depth': 2,         # #if 0 최대 중첩
+    'includes': 10,         # DBIO/모듈 include 수
+    'seed': 0,
+}
+
+# ****************************************************************
+# 합성 소스 생성 (SWING 스타일)
+# ****************************************************************
+def generate_source(index, rnd, config):
+    main = 'zbchm{:08d}'.format(index)
+    funcs = ['bch_func_{}'.format(i) for i in range(config['funcs'])]
+
+    dbios = ['ZBCH_TBL{}_S{:04d}'.format(i, rnd.randint(0, 9999)) for i in range(config['includes'] // 2)]
+    modules = ['zbchm{:08d}'.format(rnd.randint(0, config['files'] * 2)) for i in range(config['includes'] - len(dbios))]
+
+    lines = ['/* {} : benchmark source */'.format(main), '#include <stdio.h>', '#include "pfmcom.h"']
+    lines += ['#include "pdb_{}.h"'.format(item.lower()) for item in dbios]
+    lines += ['#include "{}.h"'.format(item) for item in modules]
+    lines += ['#include "coapi.h"', '#define BCH_MAX_CNT 100', '#define BCH_INPUT XXXINPT_1']
+    lines += ['static int {}(bch_ctx_t *ctx, bch_io_t *io);'.format(item) for item in funcs]
+
+    def statement(depth):
+        r = rnd.random()
+
+        if dbios and r < config['dbio_density']:
+            dbio = rnd.choice(dbios)
+            return rnd.choice([
+                'rc = mpfmdbio("{}", &io->dbio);'.format(dbio),
+                'rc = mpfmdbio_fetch(ctx->dbio_nm, &io->dbio);',
+                'memset(buf, 0x00, LEN_{}_BCH_COL_I);'.format(dbio),
+                'io->size = SQLSZ_{};'.format(dbio),
+            ])
+
+        r -= config['dbio_density']
+        if modules and r < config['dlcall_density']:
+            return 'rc = mpfm_dlcall("{}", ctx);'.format(rnd.choice(modules))
+
+        r = rnd.random()
+        if depth > 0 and r < 0.1:
+            body = [statement(depth - 1) for i in range(2)]
+            return '\n'.join(['#if 0'] + body + ['#else', statement(depth - 1), '#endif'])
+        elif r < 0.4:
+            return 'rc = {}(ctx, io);'.format(rnd.choice(funcs))
+        elif r < 0.5:
+            return 'CO_init(); // common api'
+        elif r < 0.6:
+            return 'PFM_DBG("rc[%d]", rc); /* log */'
+        else:
+            return 'rc = rc + {};'.format(rnd.randint(0, 9))
+
+    for func in [main] + funcs:
+        if func == main:
+            lines.append('int {}(bch_ctx_t *ctx, bch_io_t *io)'.format(func))
+        else:
+            lines.append('static int {}(bch_ctx_t *ctx, bch_io_t *io)'.format(func))
+        lines += ['{', '    int rc = 0;', '    char buf[BCH_MAX_CNT];']
+        lines += [statement(config['if0_depth']) for i in range(config['stmts'])]
+        lines += ['    return rc;', '}']
+
+    return main + '.c', '\n'.join(lines) + '\n'
+
+def generate_corpus(path, **config):
+    config = dict(CORPUS_CONFIG, **config)
+    rnd = random.Random(config['seed'])
+    os.makedirs(path, exist_ok=True)
+
+    filenames = []
+    for index in range(config['files']):
+        name, text = generate_source(index, rnd, config)
+        filename = os.path.join(path, name)
+
+        with open(filename, 'w', encoding='cp949') as fp:
+            fp.write(text)
+        filenames.append(filename)
+
+    return filenames
+
+# ****************************************************************
+# 단계별 시간 측정 : SwingCParser/SwingCAnalyzer의 Stats 사용
+# ****************************************************************
+def run(filenames, in_memory=False, repeat=1, backend='clang'):
+    stats = Stats('bench')
+
+    for path in (swingc_parser.PREPROC_PATH, swingc_parser.HEADER_PATH):
+        os.makedirs(path, exist_ok=True)
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        for filename in filenames:
+            SwingCAnalyzer(SwingCParser(filename, in_memory, stats, cpp=backend))
+    elapsed = time.perf_counter() - start
+
+    # analyze.* 단계는 analyze로 합산
+    timings = dict.fromkeys(STAGES, 0.0)
+    for stage, value in stats.wall.items():
+        timings[stage.split('.')[0]] += value
+
+    count = len(filenames) * repeat
+    lines = stats.counters.get('lines', 0)
+
+    return {
+        'files': count,
+        'lines': lines,
+        'elapsed': elapsed,
+        'files_per_sec': count / elapsed if elapsed else 0.0,
+        'lines_per_sec': lines / elapsed if elapsed else 0.0,
+        'stages': timings,
+        'detail': stats.export(),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'env': {
+            'python': platform.python_version(),
+            'pycparser': pycparser.__version__,
+            'cpp': swingc_parser.CPP_PATH if backend == 'clang' else backend,
+            'in_memory': in_memory,
+        },
+    }
+
+# 두 결과 비교 : 단계별 (이전, 현재, 비율)
+def compare(old, new):
+    rows = []
+    for stage in STAGES + ('elapsed',):
+        if stage == 'elapsed':
+            before, after = old['elapsed'], new['elapsed']
+        else:
+            before, after = old['stages'].get(stage, 0.0), new['stages'].get(stage, 0.0)
+        rows.append((stage, before, after, after / before if before else None))
+    return rows
+
+# ****************************************************************
+# 호출되지 않는 static 함수 판단 회귀 benchmark
+# 이전 fixpoint 반복과 SwingCAnalyzer.track_unreachable_funcs(worklist)를
+# random 호출 그래프에서 비교하고, 호출 chain으로 시간 측정
+# ****************************************************************
+class GraphVisit(object):
+    def __init__(self, main, defns, calls):
+        self.main = main
+        self.defns = defns
+        self.calls = calls
+
+class GraphParser(object):
+    def __init__(self, visit):
+        self.visit = visit
+        self.basename = visit.main + '.c'
+        self.stats = None
+
+# 이전 구현 : 호출되지 않는 함수가 없어질 때까지 전체 호출 리스트를 다시 걸러냄
+def fixpoint_unreachable(v):
+    real_calls = v.calls.copy()
+    outsiders = []
+
+    while True:
+        callees = set([item.callee for item in real_calls if item.callee in v.defns])
+        outsiders.extend([item for item in v.defns if item not in callees and item != v.main])
+
+        if len(real_calls) == len([item for item in real_calls if item.caller not in outsiders]):
+            break
+        else:
+            real_calls = [item for item in real_calls if item.caller not in outsiders]
+
+    return real_calls, sorted(set(outsiders))
+
+def worklist_unreachable(v):
+    analyzer = SwingCAnalyzer.__new__(SwingCAnalyzer)
+    analyzer.parser = GraphParser(v)
+    analyzer.stats = None
+    analyzer.track_unreachable_funcs()
+    return analyzer.real_calls, analyzer.outsiders
+
+# 자기 호출, 순환, main함수가 없는 파일을 포함한 random 호출 그래프
+def random_graph(rnd, max_funcs, max_calls):
+    main = 'zbchm00000000'
+    defns = [main] + ['bch_func_{}'.format(i) for i in range(rnd.randint(0, max_funcs))]
+    if rnd.random() < 0.2:
+        defns[0] = 'bch_no_main'
+
+    calls = []
+    for func in defns:
+        count = rnd.randint(0, max_calls)
+        if not count:
+            calls.append(Call(func))
+        for i in range(count):
+            callee = rnd.choice(defns + ['CO_init', None])
+            calls.append(Call(func, callee, 'FUNCTION' if callee else None))
+
+    return GraphVisit(main, defns, calls)
+
+# main --> (호출 없음), f0 --> f1 --> ... : 이전 구현의 최악 경우 (1회 반복에 1개씩 제거)
+def chain_graph(n):
+    main = 'zbchm00000000'
+    defns = [main] + ['bch_func_{}'.format(i) for i in range(n)]
+    calls = [Call(main)] + [Call(defns[i], defns[i + 1], 'FUNCTION') for i in range(1, n)] + [Call(defns[-1])]
+    return GraphVisit(main, defns, calls)
+
+def run_unreachable(graphs=3000, max_funcs=15, max_calls=3, chains=(100, 300), seed=0):
+    rnd = random.Random(seed)
+    mismatches = []
+
+    for index in range(graphs):
+        v = random_graph(rnd, max_funcs, max_calls)
+        if fixpoint_unreachable(v) != worklist_unreachable(v):
+            mismatches.append(index)
+
+    timings = []
+    for n in chains:
+        v = chain_graph(n)
+
+        start = time.perf_counter()
+        expected = fixpoint_unreachable(v)
+        fixpoint = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = worklist_unreachable(v)
+        worklist = time.perf_counter() - start
+
+        timings.append({'funcs': n, 'fixpoint': fixpoint, 'worklist': worklist, 'same': expected == result})
+
+    return {'graphs': graphs, 'seed': seed, 'mismatches': mismatches, 'chains': timings}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.bench')
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    ap_run = sub.add_parser('run', help='합성 소스 생성 후 단계별 시간 측정')
+    for key, value in CORPUS_CONFIG.items():
+        ap_run.add_argument('--' + key.replace('_', '-'), type=type(value), default=value)
+    ap_run.add_argument('--corpus', default=os.path.join(BENCH_PATH, 'corpus'))
+    ap_run.add_argument('--repeat', type=int, default=1)
+    ap_run.add_argument('--in-memory', action='store_true')
+    ap_run.add_argument('--cpp', default=swingc_parser.CPP_PATH)
+    ap_run.add_argument('--backend', choices=swingc_parser.CPP_BACKENDS, default='clang')
+    ap_run.add_argument('--out', help='결과 json 파일')
+
+    ap_cmp = sub.add_parser('compare', help='두 결과 json 비교')
+    ap_cmp.add_argument('old')
+    ap_cmp.add_argument('new')
+
+    ap_unreach = sub.add_parser('unreachable', help='호출되지 않는 static 함수 판단 : 이전 구현과 결과, 시간 비교')
+    ap_unreach.add_argument('--graphs', type=int, default=3000)
+    ap_unreach.add_argument('--max-funcs', type=int, default=15)
+    ap_unreach.add_argument('--max-calls', type=int, default=3)
+    ap_unreach.add_argument('--chains', type=int, nargs='*', default=[100, 300])
+    ap_unreach.add_argument('--seed', type=int, default=0)
+
+    args = ap.parse_args(argv)
+
+    if args.command == 'run':
+        config = {key: getattr(args, key) for key in CORPUS_CONFIG}
+        swingc_parser.CPP_PATH = args.cpp
+
+        filenames = generate_corpus(args.corpus, **config)
+        result = run(filenames, args.in_memory, args.repeat, args.backend)
+        result['config'] = config
+
+        text = json.dumps(result, indent=2)
+        if args.out:
+            with open(args.out, 'w') as fp:
+                fp.write(text)
+        print(text)
+    elif args.command == 'unreachable':
+        result = run_unreachable(args.graphs, args.max_funcs, args.max_calls, args.chains, args.seed)
+
+        print('{} random graphs, {} mismatches'.format(result['graphs'], len(result['mismatches'])))
+        for item in result['chains']:
+            print('chain {:>6} fixpoint {:>10.4f}s worklist {:>10.6f}s {}'.format(
+                item['funcs'], item['fixpoint'], item['worklist'], 'same' if item['same'] else 'DIFFERENT'))
+
+        if result['mismatches'] or not all(item['same'] for item in result['chains']):
+            return 1
+    else:
+        with open(args.old) as fp:
+            old = json.load(fp)
+        with open(args.new) as fp:
+            new = json.load(fp)
+
+        for stage, before, after, ratio in compare(old, new):
+            print('{:<12} {:>10.4f} {:>10.4f} {:>8}'.format(stage, before, after, '-' if ratio is None else '{:.2f}x'.format(ratio)))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from swingc.tables import CONST_PATH
+from swingc.catalog import CATALOG_PATH
+from swingc.parser import HEADER_PATH
+
+CACHE_PATH = 'res/cache'
+
+# 분석 로직이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 2
+
+# 기본 최대 크기 : 256MB
+MAX_BYTES = 256 * 1024 * 1024
+
+COMMON_HEADER = os.path.join(HEADER_PATH, 'common_fake.h')
+
+# salt 디렉토리명 : sha1 앞 16자리
+SALT_PATTERN = re.compile(r'[0-9a-f]{16}$')
+
+
+# SwingCAnalyzer.export() 결과를 소스 내용 hash로 저장하는 디스크 캐시
+#
+# res/cache/<salt>/<key>.json
+#   - salt : CACHE_VERSION, common_fake.h, const.py, API 카탈로그 내용의 hash
+#   - key  : salt, basename, 원본 소스 내용의 hash
+class ResultCache(object):
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_BYTES):
+        self.root = path
+        self.max_bytes = max_bytes
+        self.salt = self.make_salt()
+        self.path = os.path.join(self.root, self.salt)
+
+        os.makedirs(self.path, exist_ok=True)
+        self.purge_stale()
+        self.size = sum(os.path.getsize(item) for item in self.entries())
+
+    def make_salt(self):
+        h = hashlib.sha1(str(CACHE_VERSION).encode())
+
+        for filename in (COMMON_HEADER, CONST_PATH, CATALOG_PATH):
+            if os.path.exists(filename):
+                with open(filename, 'rb') as fp:
+                    h.update(fp.read())
+
+        return h.hexdigest()[:16]
+
+    # salt가 다른 (common_fake.h, const.py, API 카탈로그가 바뀐) 캐시 삭제
+    # root를 다른 용도와 같이 쓰는 경우(ex. res)를 위해 salt 형식의 디렉토리만 삭제
+    def purge_stale(self):
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name != self.salt and SALT_PATTERN.match(name) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        self.size = 0
+
+    def entries(self):
+        return [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith('.json')]
+
+    # variant : 같은 소스라도 결과 형식이 다르면 구분 (ex. 'calls')
+    def key(self, filename, variant=''):
+        h = hashlib.sha1(self.salt.encode())
+        h.update(os.path.basename(filename).encode())
+        h.update(variant.encode())
+
+        with open(filename, 'rb') as fp:
+            h.update(fp.read())
+
+        return h.hexdigest()
+
+    def get(self, key):
+        filename = os.path.join(self.path, key + '.json')
+
+        try:
+            with open(filename, 'r') as fp:
+                result = json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+        # LRU : 조회된 항목은 mtime 갱신
+        os.utime(filename)
+        return result
+
+    def put(self, key, result):
+        filename = os.path.join(self.path, key + '.json')
+        tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+
+        with open(tmp_filename, 'w') as fp:
+            json.dump(result, fp)
+
+        self.size += os.path.getsize(tmp_filename)
+        os.replace(tmp_filename, filename)
+
+        if self.size > self.max_bytes:
+            self.evict()
+
+    # 오래된 항목부터 삭제해서 max_bytes의 80%까지 줄임
+    def evict(self):
+        entries = []
+        for filename in self.entries():
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        self.size = sum(item[1] for item in entries)
+
+        for mtime, size, filename in sorted(entries):
+            if self.size <= self.max_bytes * 0.8:
+                break
+
+            try:
+                os.remove(filename)
+            except OSError:
+                continue
+            self.size -= size
@@ -0,0 +1,294 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+from swingc.batch import find_sources, analyze_tree
+
+CALLGRAPH_PATH = 'res/callgraph.db'
+
+CALL_KINDS = ('FUNCTION', 'MODULE', 'DBIO', 'API')
+
+# nodes : 모듈 main함수, static 함수, DBIO, 공통API
+#   - static 함수는 파일마다 이름이 겹칠 수 있으므로 <main>:<함수명>
+#   - DBIO/모듈명이 상수가 아닌 호출(ctx->dbio_nm 등)은 <main>:<표현식> (dynamic)
+#   - file : 정의된 파일 (호출만 되는 노드는 NULL)
+# edges : caller --> callee
+#   - real : 호출되지 않는 static 함수에서의 호출이 아님
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT NOT NULL UNIQUE,
+    main    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT NOT NULL UNIQUE,
+    kind    TEXT NOT NULL,
+    file    INTEGER
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src     INTEGER NOT NULL,
+    dst     INTEGER NOT NULL,
+    kind    TEXT NOT NULL,
+    file    INTEGER NOT NULL,
+    real    INTEGER NOT NULL,
+    dynamic INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS edges_src ON edges (src, real);
+CREATE INDEX IF NOT EXISTS edges_dst ON edges (dst, real);
+CREATE INDEX IF NOT EXISTS edges_file ON edges (file);
+CREATE INDEX IF NOT EXISTS nodes_kind ON nodes (kind);
+CREATE INDEX IF NOT EXISTS nodes_file ON nodes (file);
+'''
+
+
+# 프로젝트 전체 호출 관계 (sqlite)
+class CallGraph(object):
+    def __init__(self, path=CALLGRAPH_PATH):
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+        # 노드명 --> id
+        self.node_ids = dict((name, id) for id, name in self.db.execute('SELECT id, name FROM nodes'))
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def node_id(self, name, kind, file=None):
+        id = self.node_ids.get(name)
+
+        if id is None:
+            id = self.db.execute('INSERT INTO nodes (name, kind, file) VALUES (?, ?, ?)', (name, kind, file)).lastrowid
+            self.node_ids[name] = id
+        elif file is not None:
+            self.db.execute('UPDATE nodes SET file = ? WHERE id = ?', (file, id))
+
+        return id
+
+    # ****************************************************************
+    # 적재
+    # ****************************************************************
+    # 파일 1개의 호출 관계(SwingCAnalyzer.export_calls) 적재, 기존 내용은 교체
+    def add_file(self, filename, calls):
+        self.remove_file(filename)
+
+        main = calls['main']
+        file = self.db.execute('INSERT INTO files (name, main) VALUES (?, ?)', (filename, main)).lastrowid
+
+        def qualify(name):
+            return name if name == main else '{}:{}'.format(main, name)
+
+        # 파일 내에서 이미 찾은 노드
+        resolved = {}
+
+        def resolve(name, kind, defined):
+            if name not in resolved:
+                resolved[name] = self.node_id(name, kind, file if defined else None)
+            return resolved[name]
+
+        resolve(main, 'MODULE', True)
+
+        edges = []
+        for caller, callee, kind, more, real in calls['calls']:
+            src = resolve(qualify(caller), 'FUNCTION' if caller != main else 'MODULE', True)
+
+            # 호출이 없는 함수 : 노드만 등록
+            if callee is None:
+                continue
+
+            dynamic = kind in ('DBIO', 'MODULE') and isinstance(more, (list, tuple)) and more[1] != 'Constant'
+
+            if kind == 'FUNCTION' or dynamic:
+                callee = qualify(callee)
+
+            dst = resolve(callee, kind, kind == 'FUNCTION')
+            edges.append((src, dst, kind, file, int(bool(real)), int(dynamic)))
+
+        self.db.executemany('INSERT INTO edges (src, dst, kind, file, real, dynamic) VALUES (?, ?, ?, ?, ?, ?)', edges)
+
+    def remove_file(self, filename):
+        row = self.db.execute('SELECT id FROM files WHERE name = ?', (filename,)).fetchone()
+        if row is None:
+            return
+
+        # 이 파일의 edge, 정의와 관련된 노드 : 삭제 후 아무 edge에도 쓰이지 않으면 같이 삭제
+        sql = '''SELECT id, name FROM nodes WHERE id IN (
+                     SELECT src FROM edges WHERE file = ? UNION SELECT dst FROM edges WHERE file = ?
+                     UNION SELECT id FROM nodes WHERE file = ?)'''
+        candidates = self.db.execute(sql, row * 3).fetchall()
+
+        self.db.execute('DELETE FROM edges WHERE file = ?', row)
+        self.db.execute('UPDATE nodes SET file = NULL WHERE file = ?', row)
+        self.db.execute('DELETE FROM files WHERE id = ?', row)
+
+        sql = '''DELETE FROM nodes WHERE id = ? AND file IS NULL
+                 AND NOT EXISTS (SELECT 1 FROM edges WHERE src = ?) AND NOT EXISTS (SELECT 1 FROM edges WHERE dst = ?)'''
+        for id, name in candidates:
+            if self.db.execute(sql, (id, id, id)).rowcount:
+                del self.node_ids[name]
+
+    # analyze_tree(..., calls=True) 결과 적재 : 적재한 파일 수
+    def ingest(self, results):
+        count = 0
+
+        for filename, result in results:
+            if result is None or 'calls' not in result:
+                continue
+
+            self.add_file(filename, result['calls'])
+            count += 1
+
+        self.db.commit()
+        return count
+
+    # ****************************************************************
+    # 조회
+    # ****************************************************************
+    def files(self):
+        return [row[0] for row in self.db.execute('SELECT name FROM files ORDER BY name')]
+
+    def nodes(self, kind=None, defined=None):
+        sql = 'SELECT name FROM nodes WHERE 1 = 1'
+        params = []
+
+        if kind is not None:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        if defined is not None:
+            sql += ' AND file IS NOT NULL' if defined else ' AND file IS NULL'
+
+        return sorted(row[0] for row in self.db.execute(sql, params))
+
+    # 분석한 파일의 main함수
+    def mains(self):
+        return sorted(set(row[0] for row in self.db.execute('SELECT main FROM files')))
+
+    # DBIO/모듈명이 상수가 아닌 호출 노드
+    def dynamic_nodes(self):
+        sql = 'SELECT DISTINCT n.name FROM edges e JOIN nodes n ON n.id = e.dst WHERE e.dynamic = 1'
+        return sorted(row[0] for row in self.db.execute(sql))
+
+    def kind(self, name):
+        row = self.db.execute('SELECT kind FROM nodes WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    # 직접 호출하는 노드 (역방향 조회)
+    def callers(self, name, kind=None, real=True):
+        return self.neighbors(name, 'dst', 'src', kind, real)
+
+    # 직접 호출되는 노드
+    def callees(self, name, kind=None, real=True):
+        return self.neighbors(name, 'src', 'dst', kind, real)
+
+    def neighbors(self, name, key, other, kind, real):
+        sql = '''SELECT DISTINCT n.name FROM edges e JOIN nodes n ON n.id = e.{other}
+                 WHERE e.{key} = (SELECT id FROM nodes WHERE name = ?) AND e.real >= ?'''.format(key=key, other=other)
+        params = [name, int(real)]
+
+        if kind is not None:
+            sql += ' AND n.kind = ?'
+            params.append(kind)
+
+        return sorted(row[0] for row in self.db.execute(sql, params))
+
+    # roots에서 호출 관계를 따라 도달 가능한 노드 (roots 포함)
+    def reachable(self, roots, kind=None, real=True):
+        return self.closure(roots, 'src', 'dst', kind, real)
+
+    # roots에 도달할 수 있는 노드 (roots 포함) : ex. DBIO를 사용하는 서비스
+    def reaching(self, roots, kind=None, real=True):
+        return self.closure(roots, 'dst', 'src', kind, real)
+
+    def closure(self, roots, key, other, kind, real):
+        if isinstance(roots, str):
+            roots = [roots]
+
+        # root가 많을 수 있으므로 임시 table 사용
+        self.db.execute('CREATE TEMP TABLE IF NOT EXISTS roots (id INTEGER PRIMARY KEY)')
+        self.db.execute('DELETE FROM roots')
+        self.db.executemany('INSERT OR IGNORE INTO roots (id) SELECT id FROM nodes WHERE name = ?', [(item,) for item in roots])
+
+        # UNION은 중복을 제거하므로 순환 호출에서도 끝남
+        sql = '''WITH RECURSIVE reach(id) AS (
+                     SELECT id FROM roots
+                     UNION
+                     SELECT e.{other} FROM edges e JOIN reach r ON e.{key} = r.id WHERE e.real >= ?
+                 )
+                 SELECT n.name FROM reach JOIN nodes n ON n.id = reach.id'''.format(key=key, other=other)
+        params = [int(real)]
+
+        if kind is not None:
+            sql += ' WHERE n.kind = ?'
+            params.append(kind)
+
+        return sorted(row[0] for row in self.db.execute(sql, params))
+
+
+# 소스 디렉토리 --> callgraph db
+# 기존 db를 쓰는 경우 paths에 없는(삭제된) 파일의 호출 관계는 제거
+def build(paths, path=CALLGRAPH_PATH, workers=None, in_memory=False, cache=None, cpp='clang'):
+    graph = CallGraph(path)
+    sources = list(find_sources(paths))
+
+    existing = set(sources)
+    for filename in graph.files():
+        if filename not in existing:
+            graph.remove_file(filename)
+
+    graph.ingest(analyze_tree(sources, workers, in_memory, cache, cpp=cpp, calls=True))
+    return graph
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.callgraph')
+    ap.add_argument('--db', default=CALLGRAPH_PATH)
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    ap_build = sub.add_parser('build', help='소스 분석 후 호출 관계 적재')
+    ap_build.add_argument('paths', nargs='+')
+    ap_build.add_argument('--workers', type=int)
+    ap_build.add_argument('--in-memory', action='store_true')
+    ap_build.add_argument('--cpp', choices=('clang', 'python'), default='clang')
+
+    for command, text in (('callers', '호출하는 노드'), ('callees', '호출되는 노드'),
+                          ('reachable', '도달 가능한 노드'), ('reaching', '도달할 수 있는 노드')):
+        ap_query = sub.add_parser(command, help=text)
+        ap_query.add_argument('names', nargs='+')
+        ap_query.add_argument('--kind', choices=CALL_KINDS)
+        ap_query.add_argument('--all', action='store_true', help='호출되지 않는 static 함수에서의 호출 포함')
+
+    args = ap.parse_args(argv)
+
+    if args.command == 'build':
+        graph = build(args.paths, args.db, args.workers, args.in_memory, cpp=args.cpp)
+        print(len(graph.files()), 'files')
+    else:
+        graph = CallGraph(args.db)
+        real = not args.all
+
+        if args.command in ('callers', 'callees'):
+            names = set()
+            for name in args.names:
+                names.update(getattr(graph, args.command)(name, args.kind, real))
+            names = sorted(names)
+        else:
+            names = getattr(graph, args.command)(args.names, args.kind, real)
+
+        for name in names:
+            print(name)
+
+    graph.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from swingc.preprocess import COMMENT_PATTERN
+
+# 공통API 카탈로그 : API 헤더에서 추출한 함수(prototype, 함수형 매크로) 목록
+# swingc.tables가 있으면 const.HEADERS 대신 사용
+CATALOG_PATH = 'res/catalog.json'
+
+# 카탈로그 파일 형식(추출 규칙 포함)이 바뀌면 올림
+CATALOG_VERSION = 2
+
+HEADER_EXT = '.h'
+
+MACRO_PATTERN = re.compile(r'\s*#\s*define\s+([A-Za-z_]\w*)\(')
+PROTOTYPE_PATTERN = re.compile(r'\s*([A-Za-z_][\w\s\*]*?[\s\*])([A-Za-z_]\w*)\s*\((.*)\)\s*$', re.DOTALL)
+
+# prototype의 return type에 올 수 없는 단어
+NOT_PROTOTYPE = frozenset(['typedef', 'return', 'else', 'do', 'goto', 'case'])
+
+# 컴파일러 확장 : 뒤의 (...)와 함께 제거
+ATTRIBUTE_PATTERN = re.compile(r'\b(?:__attribute__|__attribute|__declspec|__asm__|__asm)\s*\(')
+
+# extern "C" { ... } : 본문이 아니라 안쪽도 top level 선언
+EXTERN_C_PATTERN = re.compile(r'\bextern\s*"C(?:\+\+)?"')
+LINKAGE_PATTERN = re.compile(EXTERN_C_PATTERN.pattern + r'\s*$')
+
+
+def comment_replacer(match):
+    s = match.group(0)
+    return " " if s.startswith('/') else s
+
+# __attribute__((...)) 등을 공백으로 바꿈 (괄호 짝을 맞춰서)
+def strip_attributes(text):
+    results = []
+    pos = 0
+
+    for match in ATTRIBUTE_PATTERN.finditer(text):
+        if match.start() < pos:
+            continue
+
+        depth = 1
+        end = match.end()
+        while end < len(text) and depth:
+            depth += {'(': 1, ')': -1}.get(text[end], 0)
+            end += 1
+
+        results.append(text[pos:match.start()])
+        results.append(' ')
+        pos = end
+
+    results.append(text[pos:])
+    return ''.join(results)
+
+# { } 안쪽(struct 멤버, inline 함수 본문)을 ';'로 바꿔서 top level 선언만 남김
+# extern "C" { } 는 괄호만 없앰 (C++ 헤더 guard)
+def top_level(text):
+    results = []
+    depth = 0
+    linkage = 0
+    pos = 0
+
+    for match in re.finditer(r'[{}]', text):
+        if match.group(0) == '{':
+            if depth == 0:
+                extern = LINKAGE_PATTERN.search(text, pos, match.start())
+                if extern:
+                    results.append(text[pos:extern.start()])
+                    results.append(';')
+                    pos = match.end()
+                    linkage += 1
+                    continue
+
+                results.append(text[pos:match.start()])
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                results.append(';')
+                pos = match.end()
+        elif linkage > 0:
+            results.append(text[pos:match.start()])
+            results.append(';')
+            pos = match.end()
+            linkage -= 1
+
+    if depth == 0:
+        results.append(text[pos:])
+    return ''.join(results)
+
+# 헤더 text --> 함수명 리스트 (선언 순서)
+def extract_prototypes(text):
+    text = re.sub(COMMENT_PATTERN, comment_replacer, text).replace('\\\n', ' ')
+    text = strip_attributes(text)
+    funcs = []
+    lines = []
+
+    for line in text.split('\n'):
+        if '#' in line and line.lstrip().startswith('#'):
+            match = MACRO_PATTERN.match(line)
+            if match:
+                funcs.append(match.group(1))
+            continue
+        lines.append(line)
+
+    text = EXTERN_C_PATTERN.sub('extern', top_level('\n'.join(lines)))
+
+    for statement in text.split(';'):
+        match = PROTOTYPE_PATTERN.match(statement)
+        if match is None:
+            continue
+
+        words = set(match.group(1).replace('*', ' ').split())
+        if words & NOT_PROTOTYPE:
+            continue
+        funcs.append(match.group(2))
+
+    # 중복 제거 (순서 유지)
+    return list(dict.fromkeys(funcs))
+
+def find_headers(path):
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(HEADER_EXT):
+                yield os.path.join(root, name)
+
+def load_catalog(path=CATALOG_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as fp:
+            catalog = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if catalog.get('version') != CATALOG_VERSION:
+        return None
+    return catalog
+
+# ****************************************************************
+# 카탈로그 생성 : 이전 카탈로그에서 mtime, 크기가 같은 헤더는 그대로 사용
+# 내용(sha1)이 같으면 prototype 추출은 생략
+#
+# {"version": 1,
+#  "headers": {header: {"mtime": ns, "size": n, "sha1": "...", "funcs": [...]}},
+#  "funcs": {func: [header basename, ...]}}
+# headers는 header_dir 기준 상대경로, funcs는 소스의 #include와 비교하므로 파일명
+# ****************************************************************
+def build_catalog(header_dir, path=CATALOG_PATH):
+    previous = (load_catalog(path) or {}).get('headers', {})
+    headers = {}
+    extracted = 0
+
+    for filename in find_headers(header_dir):
+        header = os.path.relpath(filename, header_dir).replace(os.sep, '/')
+
+        # 파일별 fake header는 API 헤더가 아님
+        if header.endswith('_fake.h'):
+            continue
+
+        st = os.stat(filename)
+        entry = previous.get(header)
+
+        if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            headers[header] = entry
+            continue
+
+        with open(filename, 'rb') as fp:
+            data = fp.read()
+        sha1 = hashlib.sha1(data).hexdigest()
+
+        if entry and entry['sha1'] == sha1:
+            funcs = entry['funcs']
+        else:
+            funcs = extract_prototypes(data.decode('cp949', 'replace'))
+            extracted += 1
+
+        headers[header] = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'sha1': sha1, 'funcs': funcs}
+
+    index = {}
+    for header in sorted(headers):
+        name = os.path.basename(header)
+        for func in headers[header]['funcs']:
+            if name not in index.setdefault(func, []):
+                index[func].append(name)
+
+    catalog = {'version': CATALOG_VERSION, 'headers': headers, 'funcs': index}
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, 'w', encoding='utf-8') as fp:
+        json.dump(catalog, fp, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+    catalog['extracted'] = extracted
+    return catalog
+
+# symtab index 형식 : (func --> headers, header --> funcs), header는 파일명
+def catalog_index(catalog):
+    func_headers = {key: tuple(value) for key, value in catalog['funcs'].items()}
+
+    header_funcs = {}
+    for header in sorted(catalog['headers']):
+        funcs = catalog['headers'][header]['funcs']
+        if funcs:
+            name = os.path.basename(header)
+            header_funcs[name] = tuple(dict.fromkeys(header_funcs.get(name, ()) + tuple(funcs)))
+
+    return func_headers, header_funcs
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.catalog')
+    ap.add_argument('--catalog', default=CATALOG_PATH)
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    ap_build = sub.add_parser('build', help='API 헤더 디렉토리에서 카탈로그 생성 (변경된 헤더만)')
+    ap_build.add_argument('header_dir')
+
+    ap_lookup = sub.add_parser('lookup', help='함수가 선언된 헤더')
+    ap_lookup.add_argument('names', nargs='+')
+
+    args = ap.parse_args(argv)
+
+    if args.command == 'build':
+        catalog = build_catalog(args.header_dir, args.catalog)
+        print('{} headers, {} funcs, {} extracted'.format(len(catalog['headers']), len(catalog['funcs']), catalog['extracted']))
+    else:
+        catalog = load_catalog(args.catalog) or {'funcs': {}}
+        for name in args.names:
+            print(name, ' '.join(catalog['funcs'].get(name, [])))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import re
+
+from swingc import tables
+
+# 호출 함수명 분류
+DBIO = 'DBIO'           # map_id로 DBIO를 호출하는 함수 (DBIO_CALL_FUNCS)
+DLCALL = 'DLCALL'       # mpfm_dlcall
+MODULE = 'MODULE'       # 모듈 main함수 직접 호출
+API = 'API'             # 공통API
+SKIP = 'SKIP'           # 제외함수 (EXCLUDE_FUNCS, EXCLUDE_FUNC_PREFIX)
+
+# 우선순위 : 작을수록 우선
+# 소스내 static 함수(선언)는 파일마다 다르므로 visitor에서 MODULE과 API 사이로 판단
+PRECEDENCE = {DBIO: 0, DLCALL: 1, MODULE: 2, API: 3, SKIP: 4}
+
+DLCALL_FUNCS = ('mpfm_dlcall',)
+MODULE_PATTERN = re.compile(r'z[a-z]{3}m[0-9a-z]{8}')
+
+
+# 모든 규칙을 함수명 dict(정확히 일치) + prefix trie + 모듈명 패턴으로 합쳐서
+# 함수명 1개를 1번의 조회로 분류 (규칙간 우선순위는 생성시에 정리)
+class Classifier(object):
+    def __init__(self, dbio_funcs=(), api_funcs=(), exclude_funcs=(), exclude_prefixes=(),
+                 dlcall_funcs=DLCALL_FUNCS, module_pattern=MODULE_PATTERN):
+        self.module_pattern = module_pattern
+
+        # 함수명 --> 분류
+        self.exact = {}
+
+        # prefix trie : 문자 --> 하위 node, None --> 분류
+        self.trie = {}
+        self.depth = 0
+        self.prefix_rank = len(PRECEDENCE)
+
+        for label, names in ((DBIO, dbio_funcs), (DLCALL, dlcall_funcs), (API, api_funcs), (SKIP, exclude_funcs)):
+            for name in names:
+                self.add_name(name, label)
+
+        for prefix in exclude_prefixes:
+            self.add_prefix(prefix, SKIP)
+
+    def better(self, old, new):
+        return new if old is None or PRECEDENCE[new] < PRECEDENCE[old] else old
+
+    def add_name(self, name, label):
+        self.exact[name] = self.better(self.exact.get(name), label)
+
+    def add_prefix(self, prefix, label):
+        node = self.trie
+        for c in prefix:
+            node = node.setdefault(c, {})
+
+        node[None] = self.better(node.get(None), label)
+        self.depth = max(self.depth, len(prefix))
+        self.prefix_rank = min(self.prefix_rank, PRECEDENCE[label])
+
+    # 분류 : 해당 없으면 None
+    def classify(self, name):
+        best = self.exact.get(name)
+        rank = PRECEDENCE[best] if best is not None else len(PRECEDENCE)
+
+        if rank > PRECEDENCE[MODULE] and self.module_pattern.match(name):
+            best, rank = MODULE, PRECEDENCE[MODULE]
+
+        # 더 우선하는 prefix 규칙이 있을 때만 trie 탐색 (가장 긴 prefix 길이까지)
+        if rank > self.prefix_rank:
+            node = self.trie
+            for c in name[:self.depth]:
+                node = node.get(c)
+                if node is None:
+                    break
+
+                label = node.get(None)
+                if label is not None and PRECEDENCE[label] < rank:
+                    best, rank = label, PRECEDENCE[label]
+
+        return best
+
+
+# 프로세스당 1개 : swingc.tables(const.py, API 카탈로그)의 규칙으로 처음 사용할 때 생성
+CLASSIFIER = None
+
+def get_classifier():
+    global CLASSIFIER
+
+    if CLASSIFIER is None:
+        CLASSIFIER = Classifier(tables.DBIO_CALL_FUNCS, tables.FUNC_HEADERS, tables.EXCLUDE_FUNCS, tables.EXCLUDE_FUNC_PREFIX)
+    return CLASSIFIER
+
+def classify(name):
+    return get_classifier().classify(name)
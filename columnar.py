@@ -0,0 +1,180 @@
+import argparse
+import csv
+import os
+import sys
+from array import array
+
+from swingc.batch import analyze_tree
+
+# pyarrow가 있으면 parquet, 없으면 csv로 저장
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+COLUMNAR_PATH = 'res/columnar'
+
+FORMATS = ('parquet', 'csv')
+
+# table --> (column, type) 리스트
+#   - str : dictionary 인코딩 (같은 문자열은 1번만 저장)
+#   - bool
+TABLES = (
+    ('files', (('file', 'str'), ('main', 'str'), ('error', 'bool'))),
+    ('calls', (('file', 'str'), ('caller', 'str'), ('callee', 'str'), ('kind', 'str'), ('more', 'str'), ('real', 'bool'))),
+    ('ids', (('file', 'str'), ('func', 'str'), ('header', 'str'), ('id', 'str'), ('kind', 'str'))),
+    ('unknown', (('file', 'str'), ('caller', 'str'), ('callee', 'str'))),
+    # SwingCAnalyzer.export() 항목 (only_decls, zero_call_dbios, ...)
+    ('findings', (('file', 'str'), ('category', 'str'), ('item', 'str'))),
+)
+
+
+class Column(object):
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+        if type == 'str':
+            # code --> 문자열, None은 -1
+            self.codes = array('i')
+            self.values = []
+            self.index = {}
+        else:
+            self.codes = array('b')
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        if self.type != 'str':
+            self.codes.append(1 if value else 0)
+            return
+
+        if value is None:
+            self.codes.append(-1)
+            return
+
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def decode(self):
+        if self.type != 'str':
+            return [bool(item) for item in self.codes]
+
+        values = self.values
+        return [values[item] if item >= 0 else None for item in self.codes]
+
+    def to_arrow(self):
+        if self.type != 'str':
+            return pyarrow.array(self.decode(), type=pyarrow.bool_())
+
+        indices = pyarrow.array([item if item >= 0 else None for item in self.codes], type=pyarrow.int32())
+        return pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(self.values, type=pyarrow.string()))
+
+
+class Table(object):
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = [Column(column, type) for column, type in columns]
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def append(self, *row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+
+    def rows(self):
+        return zip(*[column.decode() for column in self.columns])
+
+    def write_csv(self, filename):
+        with open(filename, 'w', newline='', encoding='utf-8') as fp:
+            writer = csv.writer(fp)
+            writer.writerow([column.name for column in self.columns])
+            writer.writerows(self.rows())
+
+    def write_parquet(self, filename):
+        table = pyarrow.Table.from_arrays([column.to_arrow() for column in self.columns], names=[column.name for column in self.columns])
+        pyarrow.parquet.write_table(table, filename)
+
+
+# batch 결과(analyze_tree(..., calls=True))를 table별 column으로 모아서 저장
+class ColumnarExport(object):
+    def __init__(self):
+        self.tables = dict((name, Table(name, columns)) for name, columns in TABLES)
+
+    def add(self, filename, result):
+        t = self.tables
+        details = (result or {}).get('calls')
+
+        t['files'].append(filename, details['main'] if details else os.path.splitext(os.path.basename(filename))[0], result is None)
+
+        if result is None:
+            return
+
+        for category, items in result.items():
+            if category != 'calls':
+                for item in items:
+                    t['findings'].append(filename, category, item)
+
+        if details is None:
+            return
+
+        for caller, callee, kind, more, real in details['calls']:
+            if isinstance(more, (list, tuple)):
+                more = '/'.join(str(item) for item in more)
+            t['calls'].append(filename, caller, callee, kind, more, real)
+
+        for func, header, id, kind in details['ids']:
+            t['ids'].append(filename, func, header, id, kind)
+
+        for caller, callee in details['unknown']:
+            t['unknown'].append(filename, caller, callee)
+
+    def ingest(self, results):
+        for filename, result in results:
+            self.add(filename, result)
+        return self
+
+    # path/<table>.parquet 또는 path/<table>.csv : 저장한 파일 목록
+    def write(self, path=COLUMNAR_PATH, format=None):
+        if format is None:
+            format = 'parquet' if pyarrow is not None else 'csv'
+        if format == 'parquet' and pyarrow is None:
+            raise RuntimeError('pyarrow is required for parquet export')
+
+        os.makedirs(path, exist_ok=True)
+        filenames = []
+
+        for name, table in sorted(self.tables.items()):
+            filename = os.path.join(path, '{}.{}'.format(name, format))
+
+            if format == 'parquet':
+                table.write_parquet(filename)
+            else:
+                table.write_csv(filename)
+            filenames.append(filename)
+
+        return filenames
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.columnar')
+    ap.add_argument('paths', nargs='+')
+    ap.add_argument('--out', default=COLUMNAR_PATH)
+    ap.add_argument('--format', choices=FORMATS)
+    ap.add_argument('--workers', type=int)
+    ap.add_argument('--in-memory', action='store_true')
+    ap.add_argument('--cpp', choices=('clang', 'python'), default='clang')
+    args = ap.parse_args(argv)
+
+    results = analyze_tree(args.paths, args.workers, args.in_memory, cpp=args.cpp, calls=True)
+
+    for filename in ColumnarExport().ingest(results).write(args.out, args.format):
+        print(filename)
+
+if __name__ == '__main__':
+    sys.exit(main())
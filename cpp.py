@@ -0,0 +1,555 @@
+import os
+import re
+
+from swingc.preprocess import COMMENT_PATTERN
+
+# clang 대신 쓰는 python 전처리기
+# Preprocessor를 거친 소스는 common_fake.h, <name>_fake.h만 include하므로
+# include, 조건부 컴파일, 매크로 치환 정도만 지원
+# (지원하지 않는 구문을 만나면 CppError)
+
+INCLUDE_DIRS = ['headers']
+
+PREDEFINED = {
+    '__STDC__': '1',
+    '__STDC_VERSION__': '199901L',
+}
+
+DIRECTIVE_PATTERN = re.compile(r'\s*#\s*(\w*)\s*(.*)')
+INCLUDE_PATTERN = re.compile(r'[<"]([^>"]+)[>"]')
+DEFINE_PATTERN = re.compile(r'([A-Za-z_]\w*)(\([^)]*\))?\s*(.*)', re.DOTALL)
+DEFINED_PATTERN = re.compile(r'\bdefined\s*(?:\(\s*([A-Za-z_]\w*)\s*\)|([A-Za-z_]\w*))')
+
+# 문자열/문자 상수, 숫자, 식별자
+TOKEN_PATTERN = re.compile(r'"(?:\\.|[^\\"\n])*"|\'(?:\\.|[^\\\'\n])*\'|\.?\d[\w.]*|[A-Za-z_]\w*')
+BODY_TOKEN_PATTERN = re.compile(r'\s*##\s*|#\s*[A-Za-z_]\w*|"(?:\\.|[^\\"\n])*"|\'(?:\\.|[^\\\'\n])*\'|\.?\d[\w.]*|[A-Za-z_]\w*')
+NUMBER_PATTERN = re.compile(r'(0[xX][0-9a-fA-F]+|\d+)([uUlL]*)$')
+
+# 치환 결과 끝의 식별자 (뒤따르는 '('와 함께 다시 치환할 함수형 매크로 후보)
+TRAILING_NAME_PATTERN = re.compile(r'(?<![\w.])([A-Za-z_]\w*)\s*$')
+
+# #if 조건식 token
+EXPR_TOKEN_PATTERN = re.compile(r'\s*(\.?\d[\w.]*|\'(?:\\.|[^\\\'\n])*\'|[A-Za-z_]\w*|&&|\|\||<<|>>|<=|>=|==|!=|[-+*/%<>&|^!~?:()])')
+
+# 이항 연산자 우선순위 (클수록 먼저)
+BINARY_PRECEDENCE = {
+    '||': 1, '&&': 2, '|': 3, '^': 4, '&': 5,
+    '==': 6, '!=': 6, '<': 7, '>': 7, '<=': 7, '>=': 7,
+    '<<': 8, '>>': 8, '+': 9, '-': 9, '*': 10, '/': 10, '%': 10,
+}
+
+# #if 계산은 intmax_t/uintmax_t (64bit)
+INT_BITS = 64
+
+
+class CppError(Exception): pass
+
+
+# #if 조건식 계산 : C 의미대로 (정수 나눗셈은 0쪽으로 버림, 비교는 왼쪽부터 0/1, unsigned 변환)
+# 값은 (정수, unsigned 여부), live가 False인 쪽(&&, ||, ?:에서 계산하지 않는 쪽)은 0으로 나눠도 오류 아님
+class IfExpression(object):
+    def __init__(self, tokens, expr):
+        self.tokens = tokens
+        self.expr = expr
+        self.pos = 0
+
+    def error(self, message):
+        return CppError('{} in #if: {}'.format(message, self.expr))
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise self.error('expected {}'.format(expected or 'expression'))
+        self.pos += 1
+        return token
+
+    def evaluate(self):
+        if not self.tokens:
+            raise self.error('empty expression')
+
+        value = self.conditional(True)
+        if self.peek() is not None:
+            raise self.error('unexpected {}'.format(self.peek()))
+        return value[0] != 0
+
+    @staticmethod
+    def wrap(value, unsigned):
+        value &= (1 << INT_BITS) - 1
+        if not unsigned and value >> (INT_BITS - 1):
+            value -= 1 << INT_BITS
+        return value, unsigned
+
+    def conditional(self, live):
+        cond = self.binary(1, live)
+        if self.peek() != '?':
+            return cond
+
+        self.take('?')
+        first = self.conditional(live and cond[0] != 0)
+        self.take(':')
+        second = self.conditional(live and cond[0] == 0)
+
+        value = first if cond[0] else second
+        return self.wrap(value[0], first[1] or second[1])
+
+    def binary(self, level, live):
+        left = self.unary(live)
+
+        while True:
+            op = self.peek()
+            precedence = BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < level:
+                return left
+            self.take()
+
+            if op == '&&':
+                right = self.binary(precedence + 1, live and left[0] != 0)
+                left = int(left[0] != 0 and right[0] != 0), False
+            elif op == '||':
+                right = self.binary(precedence + 1, live and left[0] == 0)
+                left = int(left[0] != 0 or right[0] != 0), False
+            else:
+                right = self.binary(precedence + 1, live)
+                left = self.apply(op, left, right, live)
+
+    def apply(self, op, left, right, live):
+        # shift는 왼쪽 operand의 type, 나머지는 한쪽이 unsigned면 unsigned
+        unsigned = left[1] if op in ('<<', '>>') else left[1] or right[1]
+        a = self.wrap(left[0], unsigned)[0]
+        b = right[0] if op in ('<<', '>>') else self.wrap(right[0], unsigned)[0]
+
+        if op in ('/', '%'):
+            if b == 0:
+                if live:
+                    raise self.error('division by zero')
+                return 0, unsigned
+            quotient = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+            return self.wrap(quotient if op == '/' else a - quotient * b, unsigned)
+        elif op in ('<<', '>>'):
+            if b < 0 or b >= INT_BITS:
+                if live:
+                    raise self.error('invalid shift count')
+                return 0, unsigned
+            return self.wrap(a << b if op == '<<' else a >> b, unsigned)
+        elif op == '*':
+            return self.wrap(a * b, unsigned)
+        elif op == '+':
+            return self.wrap(a + b, unsigned)
+        elif op == '-':
+            return self.wrap(a - b, unsigned)
+        elif op == '&':
+            return self.wrap(a & b, unsigned)
+        elif op == '^':
+            return self.wrap(a ^ b, unsigned)
+        elif op == '|':
+            return self.wrap(a | b, unsigned)
+        elif op == '==':
+            return int(a == b), False
+        elif op == '!=':
+            return int(a != b), False
+        elif op == '<':
+            return int(a < b), False
+        elif op == '>':
+            return int(a > b), False
+        elif op == '<=':
+            return int(a <= b), False
+        else:
+            return int(a >= b), False
+
+    def unary(self, live):
+        token = self.take()
+
+        if token == '(':
+            value = self.conditional(live)
+            self.take(')')
+            return value
+        elif token == '+':
+            return self.unary(live)
+        elif token == '-':
+            value, unsigned = self.unary(live)
+            return self.wrap(-value, unsigned)
+        elif token == '~':
+            value, unsigned = self.unary(live)
+            return self.wrap(~value, unsigned)
+        elif token == '!':
+            return int(self.unary(live)[0] == 0), False
+        elif token[0].isdigit() or token[0] == '.':
+            return self.number(token)
+        elif token[0] == "'":
+            return self.char(token)
+        elif token[0].isalpha() or token[0] == '_':
+            # 치환 후에도 남은 식별자는 0
+            return 0, False
+        else:
+            raise self.error('unexpected {}'.format(token))
+
+    def number(self, token):
+        literal = NUMBER_PATTERN.match(token)
+        if literal is None:
+            raise self.error('invalid number {}'.format(token))
+
+        digits, suffix = literal.groups()
+        if len(digits) > 1 and digits[0] == '0' and digits[1] not in 'xX':
+            if not re.match(r'[0-7]+$', digits):
+                raise self.error('invalid octal number {}'.format(token))
+            value = int(digits, 8)
+        else:
+            value = int(digits, 0)
+
+        # 접미사가 없어도 intmax_t 범위를 넘는 8/16진수는 unsigned
+        unsigned = 'u' in suffix.lower() or value >> (INT_BITS - 1) != 0
+        if value >> INT_BITS:
+            raise self.error('integer constant is too large {}'.format(token))
+        return self.wrap(value, unsigned)
+
+    def char(self, token):
+        try:
+            value = token[1:-1].encode('latin-1', 'backslashreplace').decode('unicode_escape')
+        except UnicodeDecodeError:
+            raise self.error('invalid character constant {}'.format(token))
+
+        if len(value) != 1 or ord(value) > 0xff:
+            raise self.error('unsupported character constant {}'.format(token))
+
+        # char는 signed
+        value = ord(value)
+        return value - 0x100 if value > 0x7f else value, False
+
+
+class Macro(object):
+    def __init__(self, name, params, body):
+        self.name = name
+        self.params = params
+        self.body = body
+        self.variadic = bool(params) and params[-1] == '...'
+
+
+class SimpleCpp(object):
+    def __init__(self, include_dirs=INCLUDE_DIRS, predefined=PREDEFINED):
+        self.include_dirs = include_dirs
+        self.predefined = predefined
+        self.macros = {}
+
+        # 헤더 파일 : path --> (mtime, lines), 한번 읽은 헤더는 다시 읽지 않음
+        self.header_cache = {}
+
+    # ****************************************************************
+    # 전처리 : 결과 text (# <line> "<file>" 표시 포함)
+    # files : {헤더명: text} (ex. 파일별 fake header)
+    # ****************************************************************
+    def preprocess(self, text, filename='<stdin>', files=None, macros=None):
+        self.files = files or {}
+        self.once = set()
+        self.macros = {}
+
+        for name, body in self.predefined.items():
+            self.macros[name] = Macro(name, None, body)
+        if macros:
+            self.macros.update(macros)
+
+        output = []
+        self.process_lines(self.split_lines(text), filename, output, 0)
+        return '\n'.join(output) + '\n'
+
+    # '\' 로 이어지는 줄을 합침
+    def split_lines(self, text):
+        return text.replace('\\\n', '').split('\n')
+
+    def read_header(self, name, current_dir, quoted):
+        if name in self.files:
+            return name, self.split_lines(self.files[name])
+
+        dirs = ([current_dir] if quoted and current_dir else []) + list(self.include_dirs)
+        for directory in dirs:
+            path = os.path.join(directory, name)
+
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+
+            cached = self.header_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                with open(path, 'r', encoding='cp949', errors='replace') as fp:
+                    text = re.sub(COMMENT_PATTERN, self.comment_replacer, fp.read())
+                cached = mtime, self.split_lines(text)
+                self.header_cache[path] = cached
+
+            return path, cached[1]
+
+        raise CppError('{}: No such file or directory'.format(name))
+
+    def comment_replacer(self, match):
+        s = match.group(0)
+        return " " if s.startswith('/') else s
+
+    def process_lines(self, lines, filename, output, depth):
+        if depth > 200:
+            raise CppError('#include nested too deeply')
+
+        output.append('# 1 "{}"'.format(filename))
+
+        # 조건부 컴파일 : [현재 블록 활성여부, 이미 참인 분기가 있었는지]
+        conds = []
+        active = True
+        block = []
+        start = [1]
+
+        # 지시문 다음 블록은 줄번호 표시 (pycparser 오류 위치)
+        def flush():
+            if block:
+                if start[0] > 1:
+                    output.append('# {} "{}"'.format(start[0], filename))
+                output.append(self.expand('\n'.join(block)))
+                del block[:]
+
+        for lineno, line in enumerate(lines, 1):
+            match = DIRECTIVE_PATTERN.match(line) if '#' in line else None
+
+            if match is None or not line.lstrip().startswith('#'):
+                if active:
+                    if not block:
+                        start[0] = lineno
+                    block.append(line)
+                continue
+
+            flush()
+            directive, rest = match.group(1), match.group(2).strip()
+
+            # 조건부 컴파일
+            if directive in ('if', 'ifdef', 'ifndef'):
+                parent = active
+                if not parent:
+                    taken = True
+                elif directive == 'ifdef':
+                    taken = rest.split()[0] in self.macros if rest else False
+                elif directive == 'ifndef':
+                    taken = rest.split()[0] not in self.macros if rest else False
+                else:
+                    taken = self.evaluate(rest)
+                conds.append([parent, taken])
+                active = parent and taken
+            elif directive == 'elif':
+                if not conds:
+                    raise CppError('{}:{}: #elif without #if'.format(filename, lineno))
+                parent, taken = conds[-1]
+                active = parent and not taken and self.evaluate(rest)
+                conds[-1][1] = taken or active
+            elif directive == 'else':
+                if not conds:
+                    raise CppError('{}:{}: #else without #if'.format(filename, lineno))
+                parent, taken = conds[-1]
+                active = parent and not taken
+                conds[-1][1] = True
+            elif directive == 'endif':
+                if not conds:
+                    raise CppError('{}:{}: #endif without #if'.format(filename, lineno))
+                active = conds.pop()[0]
+            elif not active:
+                continue
+            # 매크로
+            elif directive == 'define':
+                self.define(rest, filename, lineno)
+            elif directive == 'undef':
+                self.macros.pop(rest.split()[0] if rest else '', None)
+            # include
+            elif directive == 'include':
+                include = INCLUDE_PATTERN.match(self.expand(rest) if rest[:1] not in '<"' else rest)
+                if include is None:
+                    raise CppError('{}:{}: invalid #include {}'.format(filename, lineno, rest))
+
+                path, header_lines = self.read_header(include.group(1), os.path.dirname(filename), rest.startswith('"'))
+                if path not in self.once:
+                    self.process_lines(header_lines, path, output, depth + 1)
+            elif directive == 'pragma':
+                if rest == 'once':
+                    self.once.add(filename)
+                else:
+                    output.append(line.strip())
+            elif directive == 'error':
+                raise CppError('{}:{}: #error {}'.format(filename, lineno, rest))
+            elif directive in ('', 'line', 'warning', 'ident'):
+                pass
+            else:
+                raise CppError('{}:{}: unsupported directive #{}'.format(filename, lineno, directive))
+
+        flush()
+
+        if conds:
+            raise CppError('{}: unterminated #if'.format(filename))
+
+    def define(self, rest, filename, lineno):
+        match = DEFINE_PATTERN.match(rest)
+        if match is None:
+            raise CppError('{}:{}: invalid #define {}'.format(filename, lineno, rest))
+
+        name, params, body = match.groups()
+        if params is not None:
+            params = [item.strip() for item in params[1:-1].split(',') if item.strip()]
+
+        self.macros[name] = Macro(name, params, body.strip())
+
+    # #if 조건식 계산 (정수 연산만, swingc.cpp.IfExpression)
+    def evaluate(self, expr):
+        def defined(match):
+            return '1' if (match.group(1) or match.group(2)) in self.macros else '0'
+
+        text = self.expand(DEFINED_PATTERN.sub(defined, expr))
+        text = DEFINED_PATTERN.sub(defined, text)
+
+        tokens = []
+        pos = 0
+        while pos < len(text.rstrip()):
+            match = EXPR_TOKEN_PATTERN.match(text, pos)
+            if match is None:
+                raise CppError('unsupported #if expression: {}'.format(expr))
+            tokens.append(match.group(1))
+            pos = match.end()
+
+        return IfExpression(tokens, expr).evaluate()
+
+    # ****************************************************************
+    # 매크로 치환
+    # ****************************************************************
+    def expand(self, text, disabled=frozenset()):
+        results = []
+        pos = 0
+
+        while True:
+            match = TOKEN_PATTERN.search(text, pos)
+            if match is None:
+                results.append(text[pos:])
+                break
+
+            results.append(text[pos:match.start()])
+            token = match.group(0)
+            pos = match.end()
+
+            macro = self.macros.get(token)
+            if macro is None or token in disabled:
+                results.append(token)
+                continue
+
+            if macro.params is None:
+                value = self.expand(macro.body, disabled | {token})
+            else:
+                # 함수형 매크로는 '('가 따라올 때만 치환
+                args, end = self.parse_args(text, pos)
+                if args is None:
+                    results.append(token)
+                    continue
+
+                body = self.substitute(macro, args, disabled)
+                value = self.expand(body, disabled | {token})
+                pos = end
+
+            # 치환 결과가 함수형 매크로 이름으로 끝나면 뒤따르는 text의 '(...)'와 함께 다시 치환
+            # ex. #define f(x) g, #define g(y) (y+1) : f(1)(2) --> (2+1)
+            value, pos = self.rescan(value, text, pos, disabled | {token}, disabled)
+            results.append(value)
+
+        return ''.join(results)
+
+    # value : 치환 결과 (hidden : value에서 치환하지 않는 매크로), text[pos:] : 뒤따르는 text
+    def rescan(self, value, text, pos, hidden, disabled):
+        while True:
+            match = TRAILING_NAME_PATTERN.search(value)
+            if match is None:
+                return value, pos
+
+            name = match.group(1)
+            macro = self.macros.get(name)
+            if macro is None or macro.params is None or name in hidden:
+                return value, pos
+
+            args, end = self.parse_args(text, pos)
+            if args is None:
+                return value, pos
+
+            body = self.substitute(macro, args, disabled)
+            value = value[:match.start()] + self.expand(body, disabled | {name})
+            hidden = disabled | {name}
+            pos = end
+
+    def parse_args(self, text, pos):
+        start = pos
+        while start < len(text) and text[start].isspace():
+            start += 1
+
+        if start >= len(text) or text[start] != '(':
+            return None, pos
+
+        args = []
+        depth = 0
+        arg_start = start + 1
+        i = start + 1
+
+        while i < len(text):
+            c = text[i]
+
+            if c in '"\'':
+                literal = TOKEN_PATTERN.match(text, i)
+                i = literal.end() if literal else i + 1
+                continue
+            elif c == '(':
+                depth += 1
+            elif c == ')':
+                if depth == 0:
+                    args.append(text[arg_start:i].strip())
+                    return args, i + 1
+                depth -= 1
+            elif c == ',' and depth == 0:
+                args.append(text[arg_start:i].strip())
+                arg_start = i + 1
+            i += 1
+
+        raise CppError('unterminated macro call')
+
+    def substitute(self, macro, args, disabled):
+        params = macro.params
+
+        if args == [''] and not params:
+            args = []
+
+        if macro.variadic:
+            fixed = len(params) - 1
+            if len(args) < fixed:
+                raise CppError('macro {} requires {} arguments'.format(macro.name, fixed))
+            values = dict(zip(params[:-1], args[:fixed]))
+            values['__VA_ARGS__'] = ', '.join(args[fixed:])
+        else:
+            if len(args) != len(params):
+                raise CppError('macro {} requires {} arguments, but {} given'.format(macro.name, len(params), len(args)))
+            values = dict(zip(params, args))
+
+        tokens = [(match.group(0), match.start(), match.end()) for match in BODY_TOKEN_PATTERN.finditer(macro.body)]
+        results = []
+        pos = 0
+
+        for index, (token, start, end) in enumerate(tokens):
+            results.append(macro.body[pos:start])
+            pos = end
+
+            # '##' 앞뒤의 인자는 치환하지 않고 그대로 붙임
+            pasted = (index > 0 and tokens[index - 1][0].strip() == '##') or \
+                     (index + 1 < len(tokens) and tokens[index + 1][0].strip() == '##' and tokens[index + 1][1] == end)
+
+            if token.strip() == '##':
+                continue
+            elif token.startswith('#') and token[1:].strip() in values:
+                value = values[token[1:].strip()]
+                results.append('"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"')))
+            elif token in values:
+                results.append(values[token] if pasted else self.expand(values[token], disabled))
+            else:
+                results.append(token)
+
+        results.append(macro.body[pos:])
+        return ''.join(results)
+
+
+# 프로세스당 1개 : 헤더 캐시를 파일간에 공유
+CPP = SimpleCpp()
@@ -0,0 +1,79 @@
+import argparse
+import sys
+
+from swingc.callgraph import CallGraph, CALLGRAPH_PATH
+from swingc.classify import MODULE_PATTERN
+
+
+# main함수명이 모듈명 패턴이 아닌 파일 (서비스, 배치)
+# 호출되지 않는 모듈을 서비스로 보면 찾으려는 고아 모듈이 root가 되므로 사용하지 않음
+def service_roots(graph):
+    return [item for item in graph.mains() if not MODULE_PATTERN.match(item)]
+
+
+# 프로젝트 전체에서 호출되지 않는 모듈, DBIO (swingc.callgraph 기반)
+# roots : 서비스 모듈 리스트, 없으면 모듈이 아닌 파일(서비스, 배치)의 main함수를 서비스로 봄
+# 호출되지 않는 static 함수에서의 호출(real이 아닌 호출)은 따라가지 않음
+class DeadCodeAnalyzer(object):
+    def __init__(self, graph, roots=None):
+        self.graph = graph
+        self.roots = sorted(roots) if roots else service_roots(graph)
+        self.analyze()
+
+    def analyze(self):
+        reached = set(self.graph.reachable(self.roots))
+
+        # 정의된(분석된) 모듈 중 도달하지 않는 모듈
+        self.dead_modules = [item for item in self.graph.nodes('MODULE', defined=True)
+                             if MODULE_PATTERN.match(item) and item not in reached]
+
+        # DBIO명이 상수인 호출만 판단
+        self.dead_dbios = [item for item in self.graph.nodes('DBIO') if ':' not in item and item not in reached]
+
+        # 도달하는 호출 중 DBIO/모듈명이 상수가 아닌 호출 : 위 결과가 정확하지 않을 수 있음
+        self.dynamic_calls = [item for item in self.graph.dynamic_nodes() if item in reached]
+
+    def show(self):
+        def head(text):
+            print('\n##', text)
+
+        def iter_print(obj, title):
+            if bool(obj):
+                head(title)
+                for idx, item in enumerate(obj):
+                    print("-", item)
+
+        iter_print(self.dead_modules, '서비스에서 도달하지 않는 모듈')
+        iter_print(self.dead_dbios, '서비스에서 도달하지 않는 DBIO')
+        iter_print(self.dynamic_calls, 'DBIO/모듈명이 상수가 아닌 호출')
+
+    def export(self):
+        export_dict = {}
+
+        def set(name, obj):
+            if bool(obj):
+                export_dict[name] = obj
+
+        set('dead_modules', self.dead_modules)
+        set('dead_dbios', self.dead_dbios)
+        set('dynamic_calls', self.dynamic_calls)
+
+        return export_dict
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.deadcode')
+    ap.add_argument('--db', default=CALLGRAPH_PATH, help='swingc.callgraph build 결과')
+    ap.add_argument('--roots', nargs='*', default=[], help='서비스 모듈')
+    ap.add_argument('--roots-file', help='서비스 모듈 목록 파일 (한 줄에 1개)')
+    args = ap.parse_args(argv)
+
+    roots = list(args.roots)
+    if args.roots_file:
+        with open(args.roots_file) as fp:
+            roots += [line.strip() for line in fp if line.strip()]
+
+    with CallGraph(args.db) as graph:
+        DeadCodeAnalyzer(graph, roots).show()
+
+if __name__ == '__main__':
+    sys.exit(main())
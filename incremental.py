@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+from swingc.batch import find_sources, analyze_tree
+from swingc.preprocess import Preprocessor
+from swingc.reader import read_source
+
+# 바뀌면 전체를 다시 분석해야 하는 파일
+GLOBAL_FILES = ('common_fake.h', 'const.py')
+
+# git revision range(ex. HEAD~1..HEAD)에서 바뀐 파일 목록 (삭제된 파일 포함)
+# git diff는 repo 최상위 기준 경로를 출력하므로 최상위 경로에 붙임 (repo가 하위 디렉토리여도 됨)
+def changed_files(rev_range, repo='.'):
+    top = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'], cwd=repo, universal_newlines=True).strip()
+    output = subprocess.check_output(['git', 'diff', '--name-only', '--no-renames', rev_range], cwd=repo, universal_newlines=True)
+    return [os.path.join(top, line) for line in output.splitlines() if line]
+
+# 바뀐 파일 때문에 다시 분석해야 하는 소스 목록
+def affected_sources(sources, changed):
+    changed_names = set(os.path.basename(item) for item in changed)
+
+    if changed_names & set(GLOBAL_FILES):
+        return list(sources)
+
+    # 소스가 직접 바뀐 경우
+    changed_paths = set(os.path.abspath(item) for item in changed)
+    targets = [item for item in sources if os.path.abspath(item) in changed_paths]
+    target_set = set(targets)
+
+    # DBIO, 모듈 헤더가 바뀐 경우 : 해당 헤더를 include하는 소스
+    changed_headers = set(item for item in changed_names if item.endswith('.h'))
+
+    if changed_headers:
+        for filename in sources:
+            if filename in target_set:
+                continue
+
+            pre = Preprocessor(os.path.basename(filename), read_source(filename))
+
+            if changed_headers.intersection(pre.headers['dbio'] + pre.headers['module']):
+                targets.append(filename)
+
+    return targets
+
+# 이전 결과(report : {filename: export dict})에 바뀐 소스만 다시 분석해서 합침
+def reanalyze(report, rev_range, paths, repo='.', workers=None, in_memory=False, cache=None, cpp='clang'):
+    sources = list(find_sources(paths))
+    targets = affected_sources(sources, changed_files(rev_range, repo))
+
+    # 이전 결과에 없는 소스도 분석
+    target_set = set(targets)
+    targets.extend([item for item in sources if item not in report and item not in target_set])
+
+    # 삭제된 소스는 제외
+    source_set = set(sources)
+    report = {key: value for key, value in report.items() if key in source_set}
+
+    for filename, result in analyze_tree(targets, workers, in_memory, cache, cpp=cpp):
+        report[filename] = result
+
+    return report
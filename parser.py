@@ -1,38 +1,95 @@
 import os
 import re
-from pycparser import parse_file
+from pycparser import parse_file, c_parser
 from pycparser.plyparser import ParseError
-from subprocess import CalledProcessError
+from subprocess import check_output, CalledProcessError
 
 from swingc.preprocess import Preprocessor
 from swingc.visitor import SwingCVisitor
+from swingc.stats import NULL_STATS
+from swingc.reader import READER
+from swingc.cpp import CppError
+from swingc.prelude import get_prelude
 
 PREPROC_PATH = 'res/preproc'
 AST_PATH = 'res/ast'
+HEADER_PATH = 'headers'
+
+CPP_PATH = 'clang'
+CPP_ARGS = ['-E', r'-Iheaders']
+
+# 전처리 backend : clang(파일마다 프로세스 실행), python(swingc.cpp, 프로세스 실행 없음)
+CPP_BACKENDS = ('clang', 'python')
 
 class SwingCParser(object):
-    def __init__(self, filename):
+    def __init__(self, filename, in_memory=False, stats=None, reader=None, cpp='clang', text=None):
         self.filename = filename
         self.basename = os.path.basename(self.filename)
+        self.in_memory = in_memory
+        
+        # stats(swingc.stats.Stats)를 주면 단계별 시간, 건수 기록
+        self.stats = stats
+        
+        # 소스 reader(swingc.reader.SourceReader) : 없으면 프로세스 공용 reader
+        self.reader = reader or READER
+        
+        if cpp not in CPP_BACKENDS:
+            raise ValueError('unknown cpp backend: {}'.format(cpp))
+        self.cpp = cpp
+        
+        # text를 주면 파일을 읽지 않고 text를 분석 (filename은 이름으로만 사용)
+        self.text = text
 
         self.process()
             
     def process(self):
+        stats = self.stats or NULL_STATS
+        
         # preprocess and export
-        with open(self.filename, 'r', encoding='cp949') as fp:
-            self.pre = Preprocessor(self.basename, fp.read())
+        with stats.stage('read'):
+            if self.text is None:
+                text = self.reader.read(self.filename)
+                self.encoding = self.reader.encoding
+            else:
+                text = self.text
+                self.encoding = None
+                
+        with stats.stage('preprocess'):
+            self.pre = Preprocessor(self.basename, text)
+            
+        stats.count('lines', text.count('\n'))
+        stats.count('dbio_headers', len(self.pre.headers['dbio']))
+            
+        with stats.stage('fake_header'):
+            self.generate_fake_header()
             
-        self.generate_fake_header()
-        self.export_src_text()
+            # in_memory : res/preproc, headers/에 파일을 쓰지 않음
+            if not self.in_memory:
+                self.export_fake_header()
+                self.export_src_text()
         
         # build ast and traverse        
+        self.error = None
         try:
-            self.ast = parse_file(os.path.join(PREPROC_PATH, self.basename), use_cpp=True, cpp_path='clang', cpp_args=['-E', r'-Iheaders'])
-            self.visit = SwingCVisitor(self.ast, self.basename, self.pre.headers)
+            with stats.stage('parse'):
+                if self.cpp == 'python':
+                    self.ast = self.parse_python()
+                elif self.in_memory:
+                    self.ast = self.parse_text()
+                else:
+                    self.ast = parse_file(os.path.join(PREPROC_PATH, self.basename), use_cpp=True, cpp_path=CPP_PATH, cpp_args=CPP_ARGS)
+                
+            with stats.stage('visit'):
+                self.visit = SwingCVisitor(self.ast, self.basename, self.pre.headers)
+                
+            stats.count('ast_nodes', self.visit.nodes)
+            stats.count('calls', len(self.visit.calls))
         except ParseError as e:
             print(self.basename, e)
-        except CalledProcessError as e:
+            self.error = e
+        except (CalledProcessError, CppError) as e:
             print(self.basename, e)
+            self.error = e
             
     def get_struct_list(self):
         struct_list = list(set(re.findall(r'\s*(\w+_t)\s+', self.pre.text)))
@@ -43,14 +100,40 @@ class SwingCParser(object):
             
     def generate_fake_header(self):
         self.get_struct_list()
-        self.fake_header = os.path.join('headers', os.path.splitext(self.basename)[0] + '_fake.h')
+        self.fake_header = os.path.join(HEADER_PATH, os.path.splitext(self.basename)[0] + '_fake.h')
         
         # generate fake header for pycparser
+        # typdef struct statement
+        self.fake_text = ''.join(["typedef int {};\n".format(struct) for struct in self.structs])
+        
+    def export_fake_header(self):
         with open(self.fake_header, 'w') as fp:
-            # typdef struct statement
-            for struct in self.structs:
-                fp.write("typedef int {};\n".format(struct))
+            fp.write(self.fake_text)
                 
     def export_src_text(self):
         with open(os.path.join(PREPROC_PATH, self.basename), 'w') as fp:
-            fp.write(self.pre.text)
\ No newline at end of file
+            fp.write(self.pre.text)
+            
+    def parse_text(self):
+        # fake header는 include하지 않고 본문에 직접 넣음
+        # 줄번호 표시로 clang, pycparser 오류가 <stdin> 대신 소스 파일명과
+        # 전처리된 소스(res/preproc에 쓰는 내용)의 줄번호를 가리키도록 함
+        include = '#include <{}>'.format(os.path.basename(self.fake_header))
+        text = '# 1 "{}"\n{}'.format(self.basename, self.pre.text)
+
+        pos = text.find(include)
+        if pos >= 0:
+            marker = '# {} "{}"'.format(text.count('\n', 0, pos) + 1, self.basename)
+            text = text[:pos] + self.fake_text + marker + text[pos + len(include):]
+        
+        # clang은 stdin으로 전처리 (common_fake.h는 headers/에서 include)
+        text = check_output([CPP_PATH, '-x', 'c'] + CPP_ARGS + ['-'], input=text, universal_newlines=True)
+        
+        return c_parser.CParser().parse(text, self.basename)
+        
+    def parse_python(self):
+        # fake header는 파일로 쓰지 않아도 되도록 메모리에서 include
+        # common_fake.h는 미리 parsing해둔 prelude 사용
+        files = {os.path.basename(self.fake_header): self.fake_text}
+        
+        return get_prelude().parse(self.pre.text, self.basename, files)
\ No newline at end of file
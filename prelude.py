@@ -0,0 +1,75 @@
+import os
+from pycparser import c_parser
+
+from swingc.cpp import CPP
+
+# 모든 소스가 include하는 공통 헤더
+COMMON_HEADER = 'common_fake.h'
+COMMON_INCLUDE = '#include <{}>'.format(COMMON_HEADER)
+
+
+# typedef 이름을 미리 알고 시작하는 parser
+# (pycparser는 typedef 이름으로 선언/표현식을 구분하므로 scope에 넣어줘야 함)
+class PreludeCParser(c_parser.CParser):
+    def __init__(self, scope=None, **kwargs):
+        super(PreludeCParser, self).__init__(**kwargs)
+        self.scope = scope or {}
+
+    def parse(self, text, filename='', debug=False):
+        self.clex.filename = filename
+        self.clex.reset_lineno()
+        self._scope_stack = [dict(self.scope)]
+        self._last_yielded_token = None
+        return self.cparser.parse(input=text, lexer=self.clex, debug=debug)
+
+
+# common_fake.h를 한번만 전처리/parsing 해두고 파일마다 재사용
+# (CParser 생성(yacc table loading) 비용도 커서 parser도 재사용)
+class Prelude(object):
+    def __init__(self, cpp=CPP, header=COMMON_HEADER):
+        self.cpp = cpp
+        self.header = header
+
+        text = cpp.preprocess('#include <{}>\n'.format(header), header)
+
+        # common_fake.h에 정의된 매크로는 파일별 전처리에 그대로 넘김
+        self.macros = dict(cpp.macros)
+
+        # parsing이 끝난 뒤의 file scope(typedef 이름 : True, 그외 : False)로 시작
+        self.parser = PreludeCParser()
+        self.ext = self.parser.parse(text, header).ext
+        self.parser.scope = self.parser._scope_stack[0]
+        self.typedefs = sorted(name for name, is_type in self.parser.scope.items() if is_type)
+
+    # 소스 text(Preprocessor 결과) --> FileAST (prelude 선언 포함)
+    # files : {헤더명: text} (파일별 fake header)
+    def parse(self, text, filename, files=None):
+        # include 줄은 빈 줄로 바꿔서 줄번호 유지
+        text = text.replace(COMMON_INCLUDE, '', 1)
+        text = self.cpp.preprocess(text, filename, files, self.macros)
+
+        ast = self.parser.parse(text, filename)
+        ast.ext[0:0] = self.ext
+        return ast
+
+
+# 프로세스당 1개 : common_fake.h가 바뀌면(mtime) 다시 만듦
+PRELUDE = None
+PRELUDE_MTIME = None
+
+def get_prelude(cpp=CPP):
+    global PRELUDE, PRELUDE_MTIME
+
+    mtime = None
+    for directory in cpp.include_dirs:
+        try:
+            mtime = os.stat(os.path.join(directory, COMMON_HEADER)).st_mtime
+            break
+        except OSError:
+            continue
+
+    if PRELUDE is None or PRELUDE.cpp is not cpp or PRELUDE_MTIME != mtime:
+        PRELUDE = Prelude(cpp)
+        PRELUDE_MTIME = mtime
+
+    return PRELUDE
@@ -1,16 +1,55 @@
 import re
 
+COMMENT_PATTERN = re.compile(r'//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|"(?:\\.|[^\\"])*"', re.DOTALL | re.MULTILINE)
+HEADER_PATTERN = re.compile(r'#\s*include\s*["<](\w+\.h)[">]')
+INCLUDE_PATTERN = re.compile(r'#\s*include.*')
+DEFINE_PATTERN = re.compile(r'#\s*define\s+(.*)')
+
+IF_PATTERN = re.compile(r'\s*#\s*if')
+IF0_PATTERN = re.compile(r'\s*#\s*if\s+0')
+ELSE_PATTERN = re.compile(r'\s*#\s*else')
+ENDIF_PATTERN = re.compile(r'\s*#\s*endif')
+
+# 줄 단위로 나눔 (split과 같지만 list를 만들지 않음)
+def iter_lines(text):
+    pos = 0
+    newline = text.find('\n')
+    
+    while newline != -1:
+        yield text[pos:newline]
+        pos = newline + 1
+        newline = text.find('\n', pos)
+        
+    yield text[pos:]
+
 class Preprocessor(object):
     basename = ''
     text = ''
     headers = {}
     
-    def __init__(self, basename, text):
+    def __init__(self, basename, text, streaming=True):
         self.basename = basename
         self.text = text
                 
-        self.process()        
+        # streaming : 한번의 순회로 처리 (False면 단계별로 text 전체를 다시 만듦)
+        if streaming:
+            self.process_stream()
+        else:
+            self.process()        
+        
+        
+    def process_stream(self):
+        headers = {'dbio': [], 'trxio': [], 'module': [], 'etc': []}
+        
+        # 주석제거 --> #if 0 블록 제거 --> include/define 추출 및 삭제 --> 코드정리
+        lines = self.iter_uncommented_lines(self.text)
+        lines = self.iter_if0_lines(lines)
+        lines = self.iter_extract_lines(lines, headers)
+        
+        body = [line.rstrip() for line in lines if line.strip()]
         
+        self.headers = {key: sorted(value) for key, value in headers.items()}
+        self.text = '\n'.join(self.fake_header_lines() + body)
         
     def process(self):
         self.strip()
@@ -38,126 +77,150 @@ class Preprocessor(object):
             else:
                 return s
 
-        pattern = re.compile(r'//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|"(?:\\.|[^\\"])*"', re.DOTALL | re.MULTILINE)        
-        self.text = re.sub(pattern, replacer, self.text)
+        self.text = re.sub(COMMENT_PATTERN, replacer, self.text)
+        
+    # 주석제거 (streaming) : 주석을 공백으로 바꾼 결과를 줄 단위로 돌려줌
+    def iter_uncommented_lines(self, text):
+        pending = ''
+        pos = 0
+        
+        for match in COMMENT_PATTERN.finditer(text):
+            start, end = match.span()
+            
+            # 주석/문자열 앞의 원문 + 문자열 (주석은 공백으로)
+            if text[start] == '/':
+                segment = text[pos:start] + " " # note: a space and not an empty string
+            else:
+                segment = text[pos:end]
+            pos = end
+            
+            if '\n' in segment:
+                lines = segment.split('\n')
+                yield pending + lines[0]
+                yield from lines[1:-1]
+                pending = lines[-1]
+            else:
+                pending += segment
+            
+        lines = text[pos:].split('\n')
+        lines[0] = pending + lines[0]
+        yield from lines
 
     # 전처리 제거(#if0 ~ #endif)
     def remove_if0_block(self):
-        rifa_pattern = re.compile('\s*#\s*if')
-        rif0_pattern = re.compile('\s*#\s*if\s+0')    
-        else_pattern = re.compile('\s*#\s*else')
-        endif_pattern = re.compile('\s*#\s*endif')
-
-        ifx_phrs_lv = -1
+        self.text = '\n'.join(self.iter_if0_lines(iter_lines(self.text)))
         
-        # max depth : 5
-        suppress = [None, None, None, None, None]
-        results = []
+    # 전처리 제거 (streaming) : 남는 줄만 돌려줌
+    def iter_if0_lines(self, lines):
+        # '#if' 단계별 suppress 여부 (중첩 깊이 제한 없음)
+        suppress_stack = []
+        suppress = False
 
-        for i, line in enumerate(self.text.split('\n')):
+        for line in lines:
+            # 전처리문이 아닌 줄
+            if '#' not in line:
+                if not suppress:
+                    yield line.rstrip()
+                continue
+                
             # ************************************
-            # meet '#if' then level+1
+            # meet '#if' then push
+            # if nested, follow parent
+            # meet '#if 0' then suppress
             # ************************************
-            if rifa_pattern.match(line):
-                ifx_phrs_lv += 1
-                suppress[ifx_phrs_lv] = False
-                
-                # ***********************************************
-                # if nested, follow parent
-                # ***********************************************
-                if ifx_phrs_lv > 0 and suppress[ifx_phrs_lv-1]:
-                    suppress[ifx_phrs_lv] = True
-                    
-                # ************************************
-                # meet '#if 0' then suppress
-                # ************************************
-                elif rif0_pattern.match(line):
-                    suppress[ifx_phrs_lv] = True
-                
-                #print(i, ifx_phrs_lv, suppress, ':', line)
+            if IF_PATTERN.match(line):
+                suppress = suppress or IF0_PATTERN.match(line) is not None
+                suppress_stack.append(suppress)
                 continue
             
             # ****************************************************
             # meet '#else' then toggle suppress
             # but, if nested, don't toggle
             # ****************************************************
-            elif else_pattern.match(line):
-                if ifx_phrs_lv > 0 and suppress[ifx_phrs_lv-1]:
-                    pass
-                else:
-                    suppress[ifx_phrs_lv] = not suppress[ifx_phrs_lv]
-                
-                #print(i, ifx_phrs_lv, suppress, ':', line)
+            elif ELSE_PATTERN.match(line):
+                if suppress_stack and not (len(suppress_stack) > 1 and suppress_stack[-2]):
+                    suppress_stack[-1] = not suppress_stack[-1]
+                    suppress = suppress_stack[-1]
                 continue
             
             # ****************************************************************
-            # meet '#endif' then suppress Off and level-1
+            # meet '#endif' then pop
             # ****************************************************************
-            elif endif_pattern.match(line):
-                #print(i, ifx_phrs_lv, suppress, ':', line)
-                suppress[ifx_phrs_lv] = None
-                ifx_phrs_lv -= 1
+            elif ENDIF_PATTERN.match(line):
+                if suppress_stack:
+                    suppress_stack.pop()
+                suppress = suppress_stack[-1] if suppress_stack else False
                 continue
 
-            #print(i, ifx_phrs_lv, suppress, ':', line)
+            if not suppress:
+                yield line.rstrip()
+        
+    # 헤더 분류 : dbio, trxio, module, etc (pfm*은 None)
+    def classify_header(self, item):
+        # pfm* 은 제외
+        if item.startswith('pfm'):
+            return None
+        
+        # dbio
+        if item.startswith('pdb_'):
+            return 'dbio'
+        # io header
+        elif item.startswith('pio_'):
+            return 'trxio'
+        # module, API
+        elif re.match(r'z\w{3}[mb]\w{8}\.h', item):
+            return 'module'
+        else:
+            return 'etc'
             
-            if not suppress[ifx_phrs_lv]:
-                results.append(line.rstrip())
+    # 원래 헤더 대신 넣을 가짜 헤더
+    def fake_header_lines(self):
+        header_name = self.basename.replace('.c', '_fake.h')
+        return ["#include <common_fake.h>", "#include <{}>".format(header_name)]
+        
+    # include/define 추출 및 삭제 (streaming)
+    def iter_extract_lines(self, lines, headers):
+        for line in lines:
+            if '#' in line:
+                for item in HEADER_PATTERN.findall(line):
+                    key = self.classify_header(item)
+                    if key:
+                        headers[key].append(item)
+                        
+                line = INCLUDE_PATTERN.sub('', line)
+                line = DEFINE_PATTERN.sub(self.define_replacer, line)
                 
-        self.text = '\n'.join(results)
+            yield line
         
     # 원래 헤더는 따로 빼네고, 가짜 헤더를 넣어둠
     def replace_extract_header(self):
-        dbio_header = []
-        trxio_header = []
-        module_header = []
-        etc_header = []
+        headers = {'dbio': [], 'trxio': [], 'module': [], 'etc': []}
         
         # 헤더 리스트 추출
-        for item in re.findall('#\s*include\s*["<](\w+\.h)[">]', self.text):
-            # pfm* 은 제외
-            if item.startswith('pfm'):
-                continue
-            
-            # dbio
-            if item.startswith('pdb_'):
-                dbio_header.append(item)
-            # io header
-            elif item.startswith('pio_'):
-                trxio_header.append(item)
-            # module, API
-            elif re.match(r'z\w{3}[mb]\w{8}\.h', item):
-                module_header.append(item)
-            else:
-                etc_header.append(item)
+        for item in HEADER_PATTERN.findall(self.text):
+            key = self.classify_header(item)
+            if key:
+                headers[key].append(item)
                 
-        self.headers = {
-            'dbio': sorted(dbio_header),
-            'trxio': sorted(trxio_header),
-            'module': sorted(module_header),
-            'etc': sorted(etc_header),
-        }
+        self.headers = {key: sorted(value) for key, value in headers.items()}
         
         # 원래 헤더들은 모두 삭제하고, fake header만 추가해둠
-        header_name = self.basename.replace('.c', '_fake.h')
-        fake_header = ''
-        fake_header += "#include <common_fake.h>\n"
-        fake_header += "#include <{}>\n".format(header_name)
+        fake_header = ''.join([line + '\n' for line in self.fake_header_lines()])
         
-        self.text = fake_header + re.sub(r'#\s*include.*', '', self.text)
+        self.text = fake_header + re.sub(INCLUDE_PATTERN, '', self.text)
         
     # define 구문 삭제
     def replace_extract_define(self):
-        def replacer(match):
-            s = match.group(1)
-            # TP INPUT 예약어는 skip
-            if 'XXXINPT_1' in s or 'INPUT->' in s:
-                return ''
-            else:
-                return match.group(0)
-            
         # TODO : 매크로 함수 어떻게 처리할지...            
-        self.text = re.sub(r'#\s*define\s+(.*)', replacer, self.text)
+        self.text = re.sub(DEFINE_PATTERN, self.define_replacer, self.text)
+        
+    def define_replacer(self, match):
+        s = match.group(1)
+        # TP INPUT 예약어는 skip
+        if 'XXXINPT_1' in s or 'INPUT->' in s:
+            return ''
+        else:
+            return match.group(0)
         
     # 매크로함수 ;으로 끝나지 않는거 보정 (컴파일시 오류는 안나지만, parsing하면 오류)
     def correct_macro_funccall(self):
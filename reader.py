@@ -0,0 +1,83 @@
+import codecs
+import io
+import mmap
+import os
+
+# 인코딩 판별 순서
+# utf-8은 strict로 먼저 시도 (cp949 소스가 utf-8로 decode되는 경우는 거의 없음)
+# euc-kr은 cp949에 포함되므로 cp949로 처리
+ENCODINGS = ('utf-8', 'cp949')
+
+# 모두 실패하면 깨진 문자만 치환해서 읽음
+FALLBACK_ENCODING = 'cp949'
+
+CHUNK_SIZE = 1024 * 1024
+
+# 이 크기 이상인 파일은 mmap, 작은 파일은 재사용 buffer로 읽음
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class SourceReader(object):
+    def __init__(self, encodings=ENCODINGS, chunk_size=CHUNK_SIZE, mmap_threshold=MMAP_THRESHOLD):
+        self.encodings = encodings
+        self.chunk_size = chunk_size
+        self.mmap_threshold = mmap_threshold
+
+        # pool worker에서 여러 파일을 연속으로 읽을 때 재사용
+        self.buffer = bytearray()
+        self.encoding = None
+
+    def read(self, filename):
+        with open(filename, 'rb') as fp:
+            size = os.fstat(fp.fileno()).st_size
+
+            if size and size >= self.mmap_threshold:
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as data:
+                        return self.decode(data)
+
+            if len(self.buffer) < size:
+                self.buffer = bytearray(size)
+
+            with memoryview(self.buffer) as buffer:
+                length = 0
+                while length < size:
+                    n = fp.readinto(buffer[length:size])
+                    if not n:
+                        break
+                    length += n
+
+                with buffer[:length] as data:
+                    return self.decode(data)
+
+    def decode(self, data):
+        for encoding in self.encodings:
+            try:
+                text = self.decode_chunks(data, encoding)
+            except UnicodeDecodeError:
+                continue
+
+            self.encoding = encoding
+            return text
+
+        self.encoding = FALLBACK_ENCODING
+        return self.decode_chunks(data, FALLBACK_ENCODING, 'replace')
+
+    # chunk 단위로 decode, 개행은 open(..., 'r')과 같이 '\n'으로 통일
+    def decode_chunks(self, data, encoding, errors='strict'):
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(errors), translate=True)
+        parts = []
+
+        for pos in range(0, data.nbytes, self.chunk_size):
+            with data[pos:pos + self.chunk_size] as chunk:
+                parts.append(decoder.decode(chunk))
+
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+
+
+# 프로세스당 1개 (SwingCParser 기본값)
+READER = SourceReader()
+
+def read_source(filename):
+    return READER.read(filename)
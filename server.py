@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from swingc.parser import SwingCParser, CPP_BACKENDS
+from swingc.analyzer import SwingCAnalyzer
+from swingc.reader import SourceReader
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+# 동시에 pool에서 처리하는 요청 수 = worker 수 x JOBS_PER_WORKER
+JOBS_PER_WORKER = 2
+
+# 대기 요청이 이보다 많으면 503으로 거절
+MAX_PENDING = 256
+
+# 요청 body 최대 크기 : 16MB
+MAX_BODY = 16 * 1024 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super(HTTPError, self).__init__(message)
+        self.status = status
+
+
+# 소스 1개 분석 (pool worker)
+def analyze_text(name, text, cpp='clang'):
+    parser = SwingCParser(name, True, cpp=cpp, text=text)
+
+    if parser.error:
+        return {'error': str(parser.error)}
+
+    analyzer = SwingCAnalyzer(parser)
+    return {'result': analyzer.export(), 'calls': analyzer.export_calls()}
+
+
+# JSON over HTTP 분석 서비스
+#   POST /analyze {"path": "src/zngmm0001000.c"}
+#   POST /analyze {"name": "zngmm0001000.c", "text": "..."}
+#   GET  /health
+# 같은 내용(이름 + text hash)의 요청이 처리중이면 결과를 같이 받음
+class AnalysisServer(object):
+    def __init__(self, workers=None, cpp='clang', max_pending=MAX_PENDING):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.cpp = cpp
+        self.max_pending = max_pending
+        self.jobs = asyncio.Semaphore((workers or os.cpu_count() or 1) * JOBS_PER_WORKER)
+
+        # content hash --> 처리중인 future
+        self.inflight = {}
+        self.pending = 0
+        self.counters = {'requests': 0, 'coalesced': 0, 'rejected': 0}
+
+    async def analyze(self, name, text):
+        key = hashlib.sha1(name.encode() + b'\0' + text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        if self.pending >= self.max_pending:
+            self.counters['rejected'] += 1
+            raise HTTPError(503, 'too many pending requests')
+
+        loop = asyncio.get_running_loop()
+        future = self.inflight[key] = loop.create_future()
+        self.pending += 1
+
+        try:
+            async with self.jobs:
+                result = await loop.run_in_executor(self.pool, analyze_text, name, text, self.cpp)
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self.pending -= 1
+            del self.inflight[key]
+
+            # 같이 기다리는 요청이 없으면 예외가 기록되지 않은 채로 남지 않도록
+            if future.done() and not future.cancelled():
+                future.exception()
+
+        return result
+
+    async def handle_request(self, method, path, body):
+        if path == '/health':
+            return dict(self.counters, pending=self.pending, status='ok')
+
+        if path != '/analyze':
+            raise HTTPError(404, 'not found')
+        if method != 'POST':
+            raise HTTPError(405, 'POST only')
+
+        try:
+            request = json.loads(body.decode('utf-8'))
+        except ValueError:
+            raise HTTPError(400, 'invalid json')
+
+        if not isinstance(request, dict):
+            raise HTTPError(400, 'invalid request')
+
+        if 'text' in request:
+            name = request.get('name') or 'stdin.c'
+            text = request['text']
+        elif 'path' in request:
+            name = request['path']
+            try:
+                # thread pool에서 읽으므로 READER(buffer 재사용)를 같이 쓰지 않고 요청마다 생성
+                text = await asyncio.get_running_loop().run_in_executor(None, SourceReader().read, name)
+            except OSError as e:
+                raise HTTPError(400, str(e))
+        else:
+            raise HTTPError(400, 'path or text is required')
+
+        if not isinstance(name, str) or not isinstance(text, str):
+            raise HTTPError(400, 'invalid request')
+
+        self.counters['requests'] += 1
+        return dict(await self.analyze(name, text), file=name)
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    method, path, version = line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, sep, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+
+                try:
+                    if length < 0:
+                        keep_alive = False
+                        raise HTTPError(400, 'invalid content-length')
+                    if length > MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, 'request too large')
+
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = 200, await self.handle_request(method, path.split('?')[0], body)
+                except HTTPError as e:
+                    status, response = e.status, {'error': str(e)}
+                except (asyncio.IncompleteReadError, asyncio.CancelledError):
+                    raise
+                except Exception as e:
+                    status, response = 500, {'error': '{}: {}'.format(e.__class__.__name__, e)}
+
+                data = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                head = ['HTTP/1.1 {} {}'.format(status, REASONS[status]),
+                        'Content-Type: application/json; charset=utf-8',
+                        'Content-Length: {}'.format(len(data)),
+                        'Connection: {}'.format('keep-alive' if keep_alive else 'close')]
+                if status == 503:
+                    head.append('Retry-After: 1')
+
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle_client, host, port)
+
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.server')
+    ap.add_argument('--host', default=HOST)
+    ap.add_argument('--port', type=int, default=PORT)
+    ap.add_argument('--workers', type=int)
+    ap.add_argument('--cpp', choices=CPP_BACKENDS, default='clang')
+    ap.add_argument('--max-pending', type=int, default=MAX_PENDING)
+    args = ap.parse_args(argv)
+
+    async def run():
+        server = AnalysisServer(args.workers, args.cpp, args.max_pending)
+        try:
+            await server.serve(args.host, args.port)
+        finally:
+            server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import json
+import resource
+import time
+from contextlib import contextmanager
+
+# 단계별 wall/cpu 시간, 건수 기록 (SwingCParser, SwingCAnalyzer의 stats 옵션)
+class Stats(object):
+    def __init__(self, name=''):
+        self.name = name
+        self.wall = {}
+        self.cpu = {}
+        self.counters = {}
+
+    # cpu 시간 : 자식 프로세스(clang) 포함
+    @staticmethod
+    def cpu_time():
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return time.process_time() + children.ru_utime + children.ru_stime
+
+    @contextmanager
+    def stage(self, name):
+        wall = time.perf_counter()
+        cpu = self.cpu_time()
+        try:
+            yield
+        finally:
+            self.wall[name] = self.wall.get(name, 0.0) + time.perf_counter() - wall
+            self.cpu[name] = self.cpu.get(name, 0.0) + self.cpu_time() - cpu
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    # batch 합산용
+    def merge(self, other):
+        if isinstance(other, Stats):
+            other = other.export()
+
+        for key in ('wall', 'cpu', 'counters'):
+            target = getattr(self, key)
+            for name, value in other[key].items():
+                target[name] = target.get(name, 0) + value
+
+    def export(self):
+        return {
+            'name': self.name,
+            'wall': dict(self.wall),
+            'cpu': dict(self.cpu),
+            'counters': dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.export(), ensure_ascii=False)
+
+    def to_prometheus(self, prefix='swingc'):
+        return to_prometheus([self.export()], prefix)
+
+
+# 기록하지 않을 때 (stats=None)
+class NullStats(object):
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def count(self, name, value=1):
+        pass
+
+
+NULL_STATS = NullStats()
+
+# Prometheus text format : export() dict 리스트
+def to_prometheus(items, prefix='swingc'):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    lines = []
+    metrics = (
+        ('wall', 'stage_wall_seconds', 'Wall time per stage'),
+        ('cpu', 'stage_cpu_seconds', 'CPU time per stage, including clang'),
+    )
+
+    for key, metric, text in metrics:
+        lines.append('# HELP {}_{} {}'.format(prefix, metric, text))
+        lines.append('# TYPE {}_{} gauge'.format(prefix, metric))
+        for item in items:
+            for stage, value in sorted(item[key].items()):
+                lines.append('{}_{}{{file="{}",stage="{}"}} {:.6f}'.format(prefix, metric, escape(item['name']), escape(stage), value))
+
+    lines.append('# HELP {}_count Counters per file'.format(prefix))
+    lines.append('# TYPE {}_count gauge'.format(prefix))
+    for item in items:
+        for name, value in sorted(item['counters'].items()):
+            lines.append('{}_count{{file="{}",name="{}"}} {}'.format(prefix, escape(item['name']), escape(name), value))
+
+    return '\n'.join(lines) + '\n'
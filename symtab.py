@@ -0,0 +1,42 @@
+from . import tables
+
+# 공통API 심볼 인덱스 : 처음 사용할 때 swingc.tables에서 읽음
+#   - FUNC_HEADERS : CO_init --> ('coapi.h',)
+#   - HEADER_FUNCS : coapi.h --> ('CO_dec_char', 'CO_enc_char', ...)
+
+
+def build_index(headers):
+    func_headers = {}
+    header_funcs = {}
+
+    # const.HEADERS 순서 유지
+    for func, header in headers:
+        func_headers.setdefault(func, []).append(header)
+        header_funcs.setdefault(header, []).append(func)
+
+    func_headers = {key: tuple(value) for key, value in func_headers.items()}
+    header_funcs = {key: tuple(value) for key, value in header_funcs.items()}
+
+    return func_headers, header_funcs
+
+
+# check func is common API
+def is_comm_func(name):
+    return name in tables.FUNC_HEADERS
+
+
+# header file(s) of API
+def get_comm_func_hdr(name):
+    return tables.FUNC_HEADERS.get(name, ())
+
+
+# API list of header file
+def get_header_funcs(header):
+    return tables.HEADER_FUNCS.get(header, ())
+
+
+# symtab.FUNC_HEADERS, symtab.HEADER_FUNCS
+def __getattr__(name):
+    if name in ('FUNC_HEADERS', 'HEADER_FUNCS'):
+        return getattr(tables, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,87 @@
+import marshal
+import os
+import sys
+
+from swingc.catalog import CATALOG_PATH, load_catalog, catalog_index
+
+# const.py 표를 처음 사용할 때 읽음
+# __pycache__/const_tables.marshal에 조회용 형태(frozenset, dict index)로 저장해두고
+# const.py가 바뀌지 않았으면 const.py를 import하지 않고 blob만 읽음
+# 공통API index는 API 카탈로그(swingc.catalog)가 있으면 카탈로그로, 없으면 const.HEADERS로 생성
+
+CONST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'const.py')
+BLOB_PATH = os.path.join(os.path.dirname(CONST_PATH), '__pycache__', 'const_tables.marshal')
+
+# blob 형식이 바뀌면 올림
+BLOB_VERSION = 2
+
+TABLE_NAMES = ('HEADERS', 'DBIO_CALL_FUNCS', 'EXCLUDE_FUNCS', 'EXCLUDE_FUNC_PREFIX', 'FUNC_HEADERS', 'HEADER_FUNCS')
+
+
+def source_stamp():
+    st = os.stat(CONST_PATH)
+
+    try:
+        path = os.path.abspath(CATALOG_PATH)
+        catalog = os.stat(path)
+        catalog = path, catalog.st_mtime_ns, catalog.st_size
+    except OSError:
+        catalog = None
+
+    return BLOB_VERSION, st.st_mtime_ns, st.st_size, catalog
+
+def build_tables():
+    from swingc import const
+    from swingc.symtab import build_index
+
+    catalog = load_catalog()
+    if catalog is not None:
+        func_headers, header_funcs = catalog_index(catalog)
+    else:
+        func_headers, header_funcs = build_index(const.HEADERS)
+
+    return {
+        'HEADERS': tuple(const.HEADERS),
+        'DBIO_CALL_FUNCS': frozenset(const.DBIO_CALL_FUNCS),
+        'EXCLUDE_FUNCS': frozenset(const.EXCLUDE_FUNCS),
+        'EXCLUDE_FUNC_PREFIX': tuple(const.EXCLUDE_FUNC_PREFIX),
+        'FUNC_HEADERS': func_headers,
+        'HEADER_FUNCS': header_funcs,
+    }
+
+def load_tables():
+    stamp = source_stamp()
+
+    try:
+        # marshal.load(fp)는 file에서 조금씩 읽어서 느림
+        with open(BLOB_PATH, 'rb') as fp:
+            blob_stamp, tables = marshal.loads(fp.read())
+        if blob_stamp == stamp:
+            return tables
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    tables = build_tables()
+
+    # 쓰기 실패(읽기 전용 설치 등)는 무시 : 다음 실행에서 다시 만듦
+    try:
+        os.makedirs(os.path.dirname(BLOB_PATH), exist_ok=True)
+        tmp = '{}.{}.tmp'.format(BLOB_PATH, os.getpid())
+        with open(tmp, 'wb') as fp:
+            marshal.dump((stamp, tables), fp)
+        os.replace(tmp, BLOB_PATH)
+    except OSError:
+        pass
+
+    return tables
+
+# 처음 접근할 때 모든 표를 module 속성으로 올림 (이후 접근은 일반 속성 조회)
+def __getattr__(name):
+    if name not in TABLE_NAMES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    module = sys.modules[__name__]
+    for key, value in load_tables().items():
+        setattr(module, key, value)
+
+    return getattr(module, name)
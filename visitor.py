@@ -1,42 +1,88 @@
 from pycparser import c_ast
 import os
 import re
-from . import const
+import sys
+from . import symtab
+from .classify import classify, DBIO, DLCALL, MODULE, API, SKIP
 
 class ModuleCallNameException(Exception): pass
 class DbioCallNameException(Exception): pass
 
+# more 값(ex. ('mpfmdbio', 'Constant'))은 같은 값끼리 객체 1개를 공유
+MORES = {}
+
+def intern_more(more):
+    if isinstance(more, str):
+        return sys.intern(more)
+    elif isinstance(more, tuple):
+        more = tuple(sys.intern(item) if isinstance(item, str) else item for item in more)
+        return MORES.setdefault(more, more)
+    return more
+
+
 class Call(object):
+    # 전체 소스의 호출 관계를 메모리에 올릴 수 있도록 __dict__ 없이, 문자열은 intern
+    __slots__ = ('caller', 'callee', 'kind', 'more')
+    
     def __init__(self, caller, callee=None, kind=None, more=None):
-        self.caller = caller        
-        self.callee = callee
-        self.kind = kind
-        self.more = more
+        self.caller = sys.intern(caller)
+        self.callee = callee if callee is None else sys.intern(callee)
+        self.kind = kind if kind is None else sys.intern(kind)
+        self.more = intern_more(more)
         
     def __repr__(self):
         return "{} → {} [{}/{}]".format(self.caller, self.callee, self.kind, self.more)
 
 
+class DbioIDMatcher(object):
+    # pattern1 : LEN_ZNGM_COMM_CD_DTL_COMM_CD_ID_I
+    # pattern2 : AS_ZNGM_COMM_CD_DTL_S1324
+    # pattern3 : SQLSZ_ZNGM_COMM_CD_DTL_S1324
+    len_suffix = re.compile(r'_[A-Z0-9_]+_[IO]')
+    
+    def __init__(self, dbio_headers):
+        # DBIO명 --> header 리스트 (파일당 1번만 생성)
+        self.names = {}
+        
+        for item in dbio_headers:
+            # pdb_zngm_comm_cd_dtl_s1324.h --> ZNGM_COMM_CD_DTL_S1324
+            dbio_name = re.match(r'pdb_(\w+)\.h', item).group(1).upper()
+            self.names.setdefault(dbio_name, []).append(item)
+            
+    # [(header, id), ...]
+    def match(self, name):
+        if name.startswith('AS_'):
+            headers = self.names.get(name[3:], [])
+        elif name.startswith('SQLSZ_'):
+            headers = self.names.get(name[6:], [])
+        elif name.startswith('LEN_'):
+            # LEN_ 뒤에서 '_' 위치마다 DBIO명 후보를 잘라서 조회
+            headers = []
+            rest = name[4:]
+            pos = rest.find('_')
+            
+            while pos != -1:
+                if rest[:pos] in self.names and self.len_suffix.match(rest, pos):
+                    headers.extend(self.names[rest[:pos]])
+                pos = rest.find('_', pos + 1)
+        else:
+            return []
+            
+        return [(item, name) for item in headers]
+
+
 class IDVisitor(c_ast.NodeVisitor):
-    def __init__(self, headers):
+    def __init__(self, headers, dbio_matcher=None):
         self.headers = headers
         self.dbio_ids = []
         
+        if dbio_matcher is None:
+            dbio_matcher = DbioIDMatcher(headers['dbio'])
+        self.dbio_matcher = dbio_matcher
+        
     def visit_ID(self, node):
         # DBIO define변수 추출
-        for item in self.headers['dbio']:
-            # pdb_zngm_comm_cd_dtl_s1324.h --> ZNGM_COMM_CD_DTL_S1324
-            dbio_name = re.match('pdb_(\w+)\.h', item).group(1).upper()
-            
-            # pattern1 : LEN_ZNGM_COMM_CD_DTL_COMM_CD_ID_I
-            # pattern2 : AS_ZNGM_COMM_CD_DTL_S1324
-            # pattern3 : SQLSZ_ZNGM_COMM_CD_DTL_S1324
-            pattern1 = re.compile(r'LEN_{}_[A-Z0-9_]+_[IO]'.format(dbio_name))
-            pattern2 = 'AS_' + dbio_name
-            pattern3 = 'SQLSZ_' + dbio_name
-            
-            if pattern1.match(node.name) or node.name in [pattern2, pattern3]:
-                self.dbio_ids.append((item, node.name))
+        self.dbio_ids.extend(self.dbio_matcher.match(node.name))
 
         # 구현필요
         for item in self.headers['module']:
@@ -53,44 +99,39 @@ class FuncCallVisitor(c_ast.NodeVisitor):
         self.calls = []
         self.unknown = []
         self.ids = []
+        
+        # 중복 체크용 (calls, unknown은 순서 유지)
+        self.call_set = set()
+        self.unknown_set = set()
 
     def visit_FuncCall(self, node):
+        self.track_call(node)
 
+        if node.args:
+            self.visit(node.args)
+
+    def track_call(self, node):
         # add func call
         def add_call(callee, kind, more=None):
             obj = kind, callee, more
-            if obj not in self.calls:
+            if obj not in self.call_set:
+                self.call_set.add(obj)
                 self.calls.append(obj)
         
         # unknown func call
         def add_unknown(callee):
-            if callee not in self.unknown:
+            if callee not in self.unknown_set:
+                self.unknown_set.add(callee)
                 self.unknown.append(callee)
 
-        # check func is common API
-        def is_comm_func(callee):
-            return len([item for item in const.HEADERS if item[0] == callee]) > 0
-        
-        # header file(s) of API
-        def get_comm_func_hdr(callee):
-            return [item[1] for item in const.HEADERS if item[0] == callee]
-            
-        # SKIP대상인지
-        def should_be_skipped(callee):
-            if callee in const.EXCLUDE_FUNCS:
-                return True
-            
-            for prefix in const.EXCLUDE_FUNC_PREFIX:
-                if name.startswith(prefix):
-                    return True
-            
-            return False
-            
         try:
             name = node.name.name
             
+            # DBIO/DLCALL/MODULE/API/SKIP 분류는 1번에 조회 (swingc.classify)
+            label = classify(name)
+            
             # DBIO : 1번째 인자가 DBIO명
-            if name in const.DBIO_CALL_FUNCS:
+            if label == DBIO:
                 # Constant
                 if isinstance(node.args.exprs[0], c_ast.Constant):
                     callee = node.args.exprs[0].value.replace('"', '')
@@ -113,7 +154,7 @@ class FuncCallVisitor(c_ast.NodeVisitor):
                 
                 add_call(callee, 'DBIO', more)
             # 모듈 dlcall : 1번째 인자가 모듈명
-            elif name == 'mpfm_dlcall':
+            elif label == DLCALL:
                 # Constant
                 if isinstance(node.args.exprs[0], c_ast.Constant):
                     callee = node.args.exprs[0].value.replace('"', '')
@@ -135,46 +176,91 @@ class FuncCallVisitor(c_ast.NodeVisitor):
                     
                 add_call(callee, 'MODULE', more)
             # 모듈 main함수 직접 호출
-            elif re.match('z[a-z]{3}m[0-9a-z]{8}', name):
+            elif label == MODULE:
                 add_call(name, 'MODULE', 'main_call')
             # 소스내 static 함수
             elif name in self.decls:
                 add_call(name, 'FUNCTION')
             # 공통API
-            elif is_comm_func(name):
-                add_call(name, 'API', get_comm_func_hdr(name))
+            elif label == API:
+                add_call(name, 'API', symtab.get_comm_func_hdr(name))
             # 제외함수(c기본 함수, SWING공통함수 등)
-            elif should_be_skipped(name):
+            elif label == SKIP:
                 pass
             # Unknown
             else:
                 add_unknown(name)
         except AttributeError as e:
             print(node, e)
+
+
+class FuncBodyVisitor(object):
+    # FuncCallVisitor + IDVisitor를 한번의 순회로 처리
+    # 재귀(generic_visit) 대신 stack으로 preorder 순회
+    def __init__(self, decls, headers, dbio_matcher=None):
+        self.fcv = FuncCallVisitor(decls)
+        self.iv = IDVisitor(headers, dbio_matcher)
+        self.nodes = 0
+        
+    @property
+    def calls(self):
+        return self.fcv.calls
+        
+    @property
+    def unknown(self):
+        return self.fcv.unknown
+        
+    @property
+    def dbio_ids(self):
+        return self.iv.dbio_ids
+        
+    def visit(self, node):
+        # (node, FuncCall 추적여부) : FuncCallVisitor는 호출부의 이름쪽은 순회하지 않음
+        stack = [(node, True)]
+        
+        while stack:
+            node, track_call = stack.pop()
+            self.nodes += 1
             
-        if node.args:
-            self.visit(node.args)
+            if isinstance(node, c_ast.ID):
+                self.iv.visit_ID(node)
+                continue
+            
+            if track_call and isinstance(node, c_ast.FuncCall):
+                self.fcv.track_call(node)
+                children = [(child, child is not node.name) for name, child in node.children()]
+            else:
+                children = [(child, track_call) for name, child in node.children()]
+            
+            stack.extend(reversed(children))
+
 
 class FuncDefVisitor(c_ast.NodeVisitor):
     def __init__(self, decls, headers):
         self.decls = decls
         self.headers = headers
+        self.dbio_matcher = DbioIDMatcher(headers['dbio'])
+        
+        # 호출 분류시 조회용 (파일당 1번만 생성)
+        self.decl_set = set(decls)
         self.defns = []
         self.calls = []
         self.unknown = []
         self.ids = []
+        self.nodes = 0
         
     def visit_FuncDef(self, node):
         # function definitions
         if node.decl.name not in self.defns:
             self.defns.append(node.decl.name)
         
-        # func call relation
-        fcv = FuncCallVisitor(self.decls)
-        fcv.visit(node)
+        # func call relation, id list : 함수 body는 한번만 순회
+        fbv = FuncBodyVisitor(self.decl_set, self.headers, self.dbio_matcher)
+        fbv.visit(node)
+        self.nodes += fbv.nodes
 
-        if fcv.calls:
-            for item in fcv.calls:
+        if fbv.calls:
+            for item in fbv.calls:
                 obj = Call(caller=node.decl.name, callee=item[1], kind=item[0], more=item[2])
                 self.calls.append(obj)
         else:
@@ -183,21 +269,14 @@ class FuncDefVisitor(c_ast.NodeVisitor):
             self.calls.append(obj)
         
         # I don't know what this function is
-        for item in fcv.unknown:
+        for item in fbv.unknown:
             obj =  node.decl.name, item
             self.unknown.append(obj)
 
         # id list
-        iv = IDVisitor(self.headers)
-        iv.visit(node)
-
-        for item in set(iv.dbio_ids):
+        for item in set(fbv.dbio_ids):
             self.ids.append((node.decl.name, item[0], item[1], 'DBIO'))
 
-        # next node
-        if node.decl.type.args:
-            self.visit(node.decl.type.args)
-
 
 class SwingCVisitor(object):
     def __init__(self, ast, basename, headers):
@@ -208,6 +287,7 @@ class SwingCVisitor(object):
         self.unknown = []
         self.ids = []
         self.outsiders = []
+        self.nodes = 0
         
         # prototype 리스트 : FuncDecl Visitor로 찾으면 FuncDef 안에것도 찾기 때문에 따로 찾음
         for item in ast.ext:
@@ -219,6 +299,7 @@ class SwingCVisitor(object):
         v.visit(ast)
         
         self.defns = v.defns
+        self.nodes = v.nodes
         self.calls = v.calls
         self.unknown = v.unknown
         self.ids = v.ids
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from swingc.batch import find_sources, analyze_file, analyze_tree
+from swingc.incremental import GLOBAL_FILES
+from swingc.parser import HEADER_PATH
+from swingc.preprocess import Preprocessor
+from swingc.prelude import get_prelude
+from swingc.reader import read_source
+
+# 감시 주기(초)
+INTERVAL = 0.5
+
+HEADER_EXT = '.h'
+
+
+# 소스 트리를 polling으로 감시하면서 바뀐 파일만 다시 분석
+# const.HEADERS index, common_fake.h prelude, 파일별 결과는 프로세스에 유지
+# (const.py가 바뀌면 다시 실행해야 함)
+class Watcher(object):
+    def __init__(self, paths, interval=INTERVAL, cpp='python', workers=None, output=None):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.interval = interval
+        self.cpp = cpp
+        self.workers = workers
+        self.output = output or sys.stdout
+
+        # 파일 --> (mtime, size)
+        self.stamps = {}
+
+        # 소스 --> SwingCAnalyzer.export() 결과 (parsing 실패는 None)
+        self.results = {}
+
+        # 소스 --> 분석 실패 메시지 (poll에서 다시 분석한 파일)
+        self.errors = {}
+
+        # 소스 --> include한 DBIO/모듈 헤더, 헤더 --> include하는 소스 (마지막 분석 기준)
+        # 헤더가 바뀌면 트리 전체를 다시 전처리하지 않고 이 index로 대상 소스를 찾음
+        self.includes = {}
+        self.includers = {}
+
+    # 감시 대상 : 소스, 트리 안의 헤더, headers/의 공통 헤더
+    def scan(self):
+        stamps = {}
+
+        for filename in find_sources(self.paths):
+            self.stamp(filename, stamps)
+
+        for path in self.paths + [HEADER_PATH]:
+            if not os.path.isdir(path):
+                continue
+            for root, dirs, files in os.walk(path):
+                for name in files:
+                    # 파일별 fake header는 분석할 때마다 새로 쓰므로 제외 (common_fake.h는 감시)
+                    if name.endswith(HEADER_EXT) and (name == 'common_fake.h' or not name.endswith('_fake.h')):
+                        self.stamp(os.path.join(root, name), stamps)
+
+        return stamps
+
+    def stamp(self, filename, stamps):
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return
+        stamps[filename] = st.st_mtime_ns, st.st_size
+
+    def start(self):
+        self.stamps = self.scan()
+
+        # 첫 분석은 pool로, 이후에는 이 프로세스에서 (prelude를 미리 parsing)
+        if self.cpp == 'python':
+            get_prelude()
+
+        sources = [item for item in self.stamps if not item.endswith(HEADER_EXT)]
+        for filename, result in analyze_tree(sources, self.workers, True, cpp=self.cpp, includes=True):
+            self.store(filename, result)
+
+        return sorted(sources)
+
+    # 분석 결과 저장 : include 목록은 역 index에 반영하고 결과에서는 뺌
+    def store(self, filename, result):
+        if result is not None:
+            includes = result.pop('includes', [])
+        else:
+            includes = self.read_includes(filename)
+
+        self.set_includes(filename, includes)
+        self.results[filename] = result
+
+    # 분석에 실패한 소스 : 전처리만 해서 include 목록을 구함 (실패하면 이전 목록 유지)
+    def read_includes(self, filename):
+        try:
+            pre = Preprocessor(os.path.basename(filename), read_source(filename))
+        except Exception:
+            return self.includes.get(filename, ())
+        return pre.headers['dbio'] + pre.headers['module']
+
+    def set_includes(self, filename, includes):
+        for header in self.includes.pop(filename, ()):
+            self.includers[header].discard(filename)
+            if not self.includers[header]:
+                del self.includers[header]
+
+        if includes is None:
+            return
+
+        self.includes[filename] = tuple(includes)
+        for header in self.includes[filename]:
+            self.includers.setdefault(header, set()).add(filename)
+
+    # 바뀐 파일 때문에 다시 분석해야 하는 소스 (incremental.affected_sources와 같은 규칙)
+    def affected(self, sources, changed):
+        changed_names = set(os.path.basename(item) for item in changed)
+
+        if changed_names & set(GLOBAL_FILES):
+            return list(sources)
+
+        source_set = set(sources)
+        targets = set(item for item in changed if item in source_set)
+
+        for name in changed_names:
+            if name.endswith(HEADER_EXT):
+                targets.update(item for item in self.includers.get(name, ()) if item in source_set)
+
+        return list(targets)
+
+    # 1회 감시 : (다시 분석한 소스, 삭제된 소스)
+    def poll(self):
+        stamps = self.scan()
+        changed = [item for item, stamp in stamps.items() if self.stamps.get(item) != stamp]
+        removed = [item for item in self.stamps if item not in stamps]
+
+        sources = [item for item in stamps if not item.endswith(HEADER_EXT)]
+        targets = self.affected(sources, changed + removed) if changed or removed else []
+
+        # 대상 파일을 정한 뒤에 반영 (실패하면 다음 감시에서 다시 비교)
+        self.stamps = stamps
+
+        # 파일 1개의 실패(분석 중 삭제 등)로 감시가 멈추지 않도록 파일별로 처리
+        self.errors = {}
+        for filename in targets:
+            try:
+                filename, result, stats = analyze_file(filename, True, False, self.cpp, includes=True)
+            except Exception as e:
+                result = None
+                self.errors[filename] = '{}: {}'.format(e.__class__.__name__, e)
+            else:
+                if result is None:
+                    self.errors[filename] = 'analysis failed'
+
+            self.store(filename, result)
+
+        removed = sorted(item for item in removed if item in self.results)
+        for filename in removed:
+            del self.results[filename]
+            self.set_includes(filename, None)
+
+        return sorted(targets), removed
+
+    def emit(self, filename, **values):
+        values['file'] = filename
+        self.output.write(json.dumps(values, ensure_ascii=False) + '\n')
+        self.output.flush()
+
+    def run(self):
+        for filename in self.start():
+            self.emit(filename, result=self.results[filename])
+
+        while True:
+            time.sleep(self.interval)
+
+            start = time.perf_counter()
+            try:
+                targets, removed = self.poll()
+            except Exception as e:
+                # ex. 헤더 변경 대상을 찾는 중에 소스가 삭제됨
+                self.emit(None, error='{}: {}'.format(e.__class__.__name__, e))
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+
+            for filename in targets:
+                if filename in self.errors:
+                    self.emit(filename, error=self.errors[filename], elapsed_ms=round(elapsed, 3))
+                else:
+                    self.emit(filename, result=self.results[filename], elapsed_ms=round(elapsed, 3))
+            for filename in removed:
+                self.emit(filename, removed=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='python -m swingc.watch')
+    ap.add_argument('paths', nargs='+')
+    ap.add_argument('--interval', type=float, default=INTERVAL)
+    ap.add_argument('--cpp', choices=('clang', 'python'), default='python')
+    ap.add_argument('--workers', type=int, help='처음 전체 분석시 worker 수')
+    args = ap.parse_args(argv)
+
+    try:
+        Watcher(args.paths, args.interval, args.cpp, args.workers).run()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    sys.exit(main())